@@ -17,28 +17,85 @@
 # 4. Reports which files were modified.
 #
 # **Technical Implementation:**
-# - Uses the `os` module for directory traversal and path manipulation.
-# - Uses standard file I/O operations for reading and writing file content.
-# - Uses the `openai` library to interact with the OpenAI API.
+# - Uses `os.scandir` for directory traversal and the `os` module for path manipulation.
+# - Uses standard file I/O operations for reading and writing file content; finished notes
+#   are written by a background thread fed through a queue.
+# - Uses the `openai` library (AsyncOpenAI client) to interact with the OpenAI API.
+# - Live requests go to gpt-4o-mini first; output is parsed with PyYAML and checked for the
+#   mandatory fields (title, date_created_at, type, tags), escalating to gpt-4o if invalid.
+# - Uses `asyncio` with a bounded semaphore so many OpenAI requests are in flight at once,
+#   paced by a token bucket to stay under 90% of the account's requests- and
+#   tokens-per-minute limits instead of running into rate-limit errors.
+# - Packs several notes (NOTES_PER_REQUEST) into each request and asks for a JSON object
+#   of YAML keyed by note path; notes missing from the response are retried one by one.
 # - Uses `python-dotenv` to load the API key from a .env.local file.
+# - Caches generated YAML in a local SQLite database (.yaml_cache.sqlite3) keyed by a hash
+#   of the rules and note inputs, so unchanged notes skip the API on re-runs. Entries hold
+#   validated YAML regardless of which model produced it.
+#   Pass --no-cache to bypass the cache.
+# - With --batch, submits all requests as one OpenAI Batch API job (half the cost and a
+#   separate rate-limit pool, but results can take up to 24 hours).
+# - Notes of any size are processed by default; the prompt carries a summary sampled from
+#   the start, middle, and end of the body. Pass --max-size KB to skip larger notes
+#   without reading them.
+# - Records a SHA-256 of every note it writes in .yaml_state.json and skips notes that are
+#   unchanged since then on later runs. Pass --force to process every note again.
 # - Includes error handling for file operations and API calls.
 # - The root directory to scan is determined dynamically based on the script's location.
 
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
 import os
+import sqlite3
 import sys
+import queue
+import threading
+import time
 import datetime
 import re
 import shutil
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict
+from typing import Iterator, List, Optional, Set, Tuple, Dict
 
-# Import the OpenAI library and dotenv for loading environment variables
+# Import the OpenAI library, dotenv for loading environment variables, and PyYAML
+# for validating generated YAML
 # You can install them using pip with the following command:
-# pip install openai python-dotenv
+# pip install openai python-dotenv pyyaml
 
-import openai  # type: ignore
+import yaml  # type: ignore
+from openai import AsyncOpenAI  # type: ignore
 from dotenv import load_dotenv  # type: ignore
 
+# --- OpenAI Settings ---
+
+# Cheaper, faster model tried first for live requests
+FAST_MODEL = "gpt-4o-mini"
+
+# Model used when the fast model's YAML fails validation, and for --batch jobs
+MODEL = "gpt-4o"
+
+# Fields every generated front matter must contain
+MANDATORY_FIELDS = ("title", "date_created_at", "type", "tags")
+
+# Response token limit per note; front matter is typically well under 200 tokens,
+# and a lower limit reserves less of the tokens-per-minute quota per request
+MAX_YAML_TOKENS = 256
+
+# --- Concurrency Settings ---
+
+# Maximum number of OpenAI requests in flight at the same time
+MAX_CONCURRENT_REQUESTS = 20
+
+# Account rate limits; requests are paced to stay under 90% of both
+REQUESTS_PER_MINUTE = 500
+TOKENS_PER_MINUTE = 450_000
+
+# Number of notes packed into each live OpenAI request
+NOTES_PER_REQUEST = 8
+
 # --- Load Environment Variables ---
 
 # Look for .env.local file in the script's directory
@@ -54,72 +111,207 @@ if not api_key:
     print("Error: OPENAI_API_KEY not found in .env.local file.", file=sys.stderr)
     sys.exit(1)
 
-# Set the API key for the OpenAI library
-openai.api_key = api_key
+# Create the async OpenAI client used for all requests
+client = AsyncOpenAI(api_key=api_key)
 print("OpenAI API configured successfully.")
 
-# --- Helper Functions ---
+# --- Rate Limiting ---
+
+
+class TokenBucket:
+    """
+    Paces OpenAI requests to stay under the account's request and token limits.
+
+    Two buckets, one for requests and one for tokens, refill continuously at a
+    fraction (headroom) of the per-minute limits. Each request waits until both
+    buckets can cover it, so requests are held back before they are sent rather
+    than rejected with a 429 and retried.
+    """
 
+    def __init__(self, rpm: int, tpm: int, headroom: float = 0.9):
+        self.request_capacity = rpm * headroom
+        self.token_capacity = tpm * headroom
+        self.available_requests = self.request_capacity
+        self.available_tokens = self.token_capacity
+        self.last_refill = time.monotonic()
+        # Created on first use so it belongs to the running event loop
+        self.condition: Optional[asyncio.Condition] = None
+
+    def _refill(self) -> None:
+        """Adds the capacity that has refilled since the last call."""
+        now = time.monotonic()
+        elapsed_minutes = (now - self.last_refill) / 60
+        self.last_refill = now
+        self.available_requests = min(
+            self.request_capacity,
+            self.available_requests + elapsed_minutes * self.request_capacity,
+        )
+        self.available_tokens = min(
+            self.token_capacity,
+            self.available_tokens + elapsed_minutes * self.token_capacity,
+        )
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Waits until one request and the given number of tokens are available.
+
+        Args:
+            tokens (int): Estimated tokens the request will consume.
+        """
+        if self.condition is None:
+            self.condition = asyncio.Condition()
+
+        # A request larger than the whole bucket would otherwise wait forever
+        tokens = min(tokens, self.token_capacity)
+
+        async with self.condition:
+            while True:
+                self._refill()
+                if self.available_requests >= 1 and self.available_tokens >= tokens:
+                    self.available_requests -= 1
+                    self.available_tokens -= tokens
+                    self.condition.notify_all()
+                    return
+
+                # Sleep until the scarcer bucket has refilled enough
+                wait_seconds = 60 * max(
+                    (1 - self.available_requests) / self.request_capacity,
+                    (tokens - self.available_tokens) / self.token_capacity,
+                )
+                try:
+                    await asyncio.wait_for(self.condition.wait(), wait_seconds)
+                except asyncio.TimeoutError:
+                    pass
 
-def has_yaml_front_matter(filepath: str) -> bool:
+
+def estimate_request_tokens(request_body: Dict) -> int:
     """
-    Checks if a file starts with YAML front matter.
+    Estimates the tokens a chat completion request will consume.
+
+    Uses the rough rule of four characters per prompt token, plus the full
+    max_tokens allowance for the response.
 
     Args:
-        filepath (str): The path to the file.
+        request_body (Dict): The chat completion parameters.
 
     Returns:
-        bool: True if YAML front matter is detected, False otherwise.
+        int: The estimated token count.
     """
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            first_line = f.readline().strip()
-            if first_line != "---":
-                return False
-            # Look for the closing '---' within the next ~30 lines
-            for i, line in enumerate(f):
-                if line.strip() == "---":
-                    return True
-                if i > 30:  # Stop checking after a reasonable number of lines
-                    break
-            return False
-    except FileNotFoundError:
-        print(f"Error: File not found during YAML check: {filepath}", file=sys.stderr)
-        return False
-    except Exception as e:
-        print(f"Error reading file {filepath} during YAML check: {e}", file=sys.stderr)
-        return False
+    prompt_chars = sum(len(message["content"]) for message in request_body["messages"])
+    return prompt_chars // 4 + request_body["max_tokens"]
+
+
+# Shared by all live requests in a run (the Batch API has its own limits)
+rate_limiter = TokenBucket(REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE)
+
+# --- Response Cache ---
+
+# SQLite database holding previously generated YAML, keyed by a hash of the prompt inputs
+CACHE_PATH = os.path.join(script_dir, ".yaml_cache.sqlite3")
 
+# Open cache connection, or None when caching is disabled (--no-cache)
+yaml_cache: Optional[sqlite3.Connection] = None
 
-def extract_content_parts(filepath: str) -> Tuple[str, str]:
+# --- Run State ---
+
+# JSON map of relative path -> SHA-256 of each note as this script last wrote it;
+# notes whose content still matches are skipped on the next run (unless --force)
+STATE_PATH = os.path.join(script_dir, ".yaml_state.json")
+
+
+def open_yaml_cache(cache_path: str) -> sqlite3.Connection:
+    """
+    Opens (and creates if needed) the persistent YAML response cache.
+
+    Args:
+        cache_path (str): Path to the SQLite database file.
+
+    Returns:
+        sqlite3.Connection: Connection to the cache database.
+    """
+    connection = sqlite3.connect(cache_path)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS yaml_cache (key TEXT PRIMARY KEY, yaml TEXT NOT NULL)"
+    )
+    return connection
+
+
+def get_cached_yaml(key: str) -> Optional[str]:
+    """Returns the cached YAML for a key, or None on a miss or when caching is off."""
+    if yaml_cache is None:
+        return None
+    row = yaml_cache.execute(
+        "SELECT yaml FROM yaml_cache WHERE key = ?", (key,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def store_cached_yaml(key: str, generated_yaml: str) -> None:
+    """Stores generated YAML in the cache (no-op when caching is off)."""
+    if yaml_cache is None:
+        return
+    with yaml_cache:
+        yaml_cache.execute(
+            "INSERT OR REPLACE INTO yaml_cache (key, yaml) VALUES (?, ?)",
+            (key, generated_yaml),
+        )
+
+
+# --- Helper Functions ---
+
+
+def extract_content_parts(content: str) -> Tuple[str, str]:
     """
-    Extracts YAML front matter and main content from a Markdown file.
+    Extracts YAML front matter and main content from a Markdown file's content.
 
     Args:
-        filepath (str): The path to the file.
+        content (str): The full content of the file.
 
     Returns:
         Tuple[str, str]: A tuple containing (yaml_content, main_content).
         If no YAML exists, yaml_content will be an empty string.
     """
+    # Check if file has YAML front matter (an opening '---' line)
+    if content.startswith(("---\n", "---\r\n")):
+        # Find the second '---' that closes the YAML block
+        _, _, rest = content.partition("---")
+        yaml_content, closing, main_content = rest.partition("---")
+        if closing:
+            return yaml_content.strip(), main_content.strip()
+
+    # If no YAML or invalid format, return empty YAML and full content
+    return "", content.strip()
+
+
+def load_state(state_path: str) -> Dict[str, str]:
+    """
+    Loads the relative path -> SHA-256 map of notes written by earlier runs.
+
+    Args:
+        state_path (str): Path to the JSON state file.
+
+    Returns:
+        Dict[str, str]: The stored hashes, or an empty dict if there is no
+        usable state file.
+    """
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            content = f.read()
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        return state if isinstance(state, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Warning: Could not read state file {state_path}: {e}", file=sys.stderr)
+        return {}
 
-        # Check if file has YAML front matter
-        if content.startswith("---"):
-            # Find the second '---' that closes the YAML block
-            parts = content.split("---", 2)
-            if len(parts) >= 3:
-                yaml_content = parts[1].strip()
-                main_content = parts[2].strip()
-                return yaml_content, main_content
-
-        # If no YAML or invalid format, return empty YAML and full content
-        return "", content.strip()
+
+def save_state(state_path: str, state: Dict[str, str]) -> None:
+    """Saves the relative path -> SHA-256 map for the next run."""
+    try:
+        with open(state_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
     except Exception as e:
-        print(f"Error extracting content from {filepath}: {e}", file=sys.stderr)
-        return "", ""
+        print(f"Warning: Could not save state file {state_path}: {e}", file=sys.stderr)
 
 
 def read_yaml_rules() -> str:
@@ -139,10 +331,11 @@ def read_yaml_rules() -> str:
             content = f.read()
 
         # Extract just the rules section (after the YAML front matter)
-        if "---" in content:
-            parts = content.split("---", 2)
-            if len(parts) >= 3:
-                return parts[2].strip()
+        _, opening, rest = content.partition("---")
+        if opening:
+            _, closing, rules = rest.partition("---")
+            if closing:
+                return rules.strip()
 
         # If no YAML or format issues, return the whole content
         return content
@@ -187,6 +380,10 @@ def create_backup(filepath: str) -> bool:
     """
     Creates a backup of the specified file before modifying it.
 
+    The backup is a hardlink to the original, so no data is copied. This is
+    safe because notes are rewritten with write_file_atomically, which gives
+    the note a new inode and leaves the backup's data untouched.
+
     Args:
         filepath (str): Path to the file to back up.
 
@@ -195,25 +392,76 @@ def create_backup(filepath: str) -> bool:
     """
     backup_path = f"{filepath}.bak"
     try:
-        shutil.copy2(filepath, backup_path)
+        # Replace any backup left over from a previous run
+        if os.path.lexists(backup_path):
+            os.remove(backup_path)
+        try:
+            os.link(filepath, backup_path)
+        except OSError:
+            # Hardlinks unsupported (cross-device, some synced/network filesystems);
+            # copyfile uses the kernel copy fast path (sendfile/fcopyfile) where available
+            shutil.copyfile(filepath, backup_path)
+            shutil.copystat(filepath, backup_path)
         return True
     except Exception as e:
         print(f"Warning: Failed to create backup of {filepath}: {e}", file=sys.stderr)
         return False
 
 
+def write_file_atomically(filepath: str, content: str) -> None:
+    """
+    Replaces a file's content via a temporary file and os.replace.
+
+    The original inode is never written to, so a hardlinked backup keeps the
+    old content, and an interrupted run cannot leave a half-written note.
+
+    Args:
+        filepath (str): Path to the file to overwrite.
+        content (str): The new file content.
+    """
+    tmp_path = f"{filepath}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        shutil.copymode(filepath, tmp_path)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 # --- OpenAI Integration ---
 
+SYSTEM_PROMPT = "You are a specialized AI that generates YAML front matter for Obsidian Markdown notes. You strictly follow the conventions specified and only output the requested YAML content. You are an expert in Obsidian knowledge management and understand precisely how to structure metadata according to provided rules."
 
-def generate_yaml_with_ai(
+
+def build_system_message(yaml_rules: str) -> str:
+    """
+    Builds the system message shared by every request in a run.
+
+    The YAML rules are identical for all notes, so they go into the system
+    message ahead of the per-note prompt. Every request then starts with the
+    same prefix, which lets OpenAI's prompt caching reuse it across requests.
+
+    Args:
+        yaml_rules (str): The YAML formatting rules.
+
+    Returns:
+        str: The system message content.
+    """
+    return f"{SYSTEM_PROMPT}\n\nYAML RULES:\n{yaml_rules}"
+
+
+def describe_note(
     file_content: str,
     filename: str,
     filepath: str = "",
     existing_yaml: str = "",
     yaml_rules: str = "",
-) -> str:
+) -> Tuple[str, str, str]:
     """
-    Generates YAML front matter content using OpenAI's API.
+    Describes one note for a YAML generation prompt.
 
     Args:
         file_content (str): The main content of the Markdown file (without YAML).
@@ -223,8 +471,10 @@ def generate_yaml_with_ai(
         yaml_rules (str, optional): The YAML formatting rules.
 
     Returns:
-        str: The generated YAML content (without the '---' markers).
-             Returns an empty string if generation fails.
+        Tuple[str, str, str]: (note_details, cache_key, fallback_yaml), where
+        note_details is the note's section of the prompt, cache_key identifies
+        the note's inputs in the YAML cache, and fallback_yaml is used if the
+        request fails.
     """
     # Extract potential title from filename or first H1 heading
     title = filename.replace(".md", "").replace("_", " ").title()  # Basic title guess
@@ -233,11 +483,6 @@ def generate_yaml_with_ai(
     if lines and lines[0].startswith("# "):
         title = lines[0][2:].strip()
 
-    # Determine relative path and folder structure for context
-    file_location = ""
-    if filepath:
-        file_location = f"Located in: {filepath}"
-
     # Extract folder structure for potential tag suggestions
     folders = []
     if filepath:
@@ -250,88 +495,454 @@ def generate_yaml_with_ai(
     # Prepare content summary for the AI
     content_summary = extract_content_summary(file_content, 2500)
 
-    try:
-        # Create a detailed prompt for the OpenAI API
-        prompt = f"""Analyze the following Markdown note and generate appropriate YAML front matter that's consistent with the provided YAML rules.
+    # Identify these exact inputs in the YAML cache. The model is left out: a
+    # request may be answered by FAST_MODEL or MODEL, and either one's validated
+    # YAML is reused for the same inputs
+    cache_key = hashlib.sha256(
+        repr((yaml_rules, filename, filepath, existing_yaml, content_summary)).encode(
+            "utf-8"
+        )
+    ).hexdigest()
 
-NOTE INFORMATION:
-Filename: {filename}
-{file_location}
-Folder structure: {', '.join(folders) if folders else 'Root directory'}
+    # Location lines only add information (and tokens) for notes inside folders
+    note_information = f"Filename: {filename}"
+    if folders:
+        note_information += (
+            f"\nLocated in: {filepath}\nFolder structure: {', '.join(folders)}"
+        )
+
+    note_details = f"""NOTE INFORMATION:
+{note_information}
 
 EXISTING YAML (if any):
 {existing_yaml}
 
-YAML RULES:
-{yaml_rules}
-
 NOTE CONTENT:
-{content_summary}
+{content_summary}"""
+
+    # Fallback to basic YAML if the API call fails
+    fallback_yaml = f"""title:
+  - {title}
+date_created_at: {datetime.date.today().isoformat()}
+type:
+  - "[[Notes]]"
+tags:
+  - "#untagged"
+"""
+
+    return note_details, cache_key, fallback_yaml
+
+
+def build_yaml_request(
+    file_content: str,
+    filename: str,
+    filepath: str = "",
+    existing_yaml: str = "",
+    yaml_rules: str = "",
+) -> Tuple[Dict, str, str]:
+    """
+    Builds the chat completion request used to generate YAML for one note.
+
+    Args:
+        file_content (str): The main content of the Markdown file (without YAML).
+        filename (str): The name of the file.
+        filepath (str, optional): The relative path of the file.
+        existing_yaml (str, optional): Any existing YAML in the file.
+        yaml_rules (str, optional): The YAML formatting rules.
+
+    Returns:
+        Tuple[Dict, str, str]: (request_body, cache_key, fallback_yaml), where
+        request_body holds the chat completion parameters, cache_key identifies
+        the request in the YAML cache, and fallback_yaml is used if the request fails.
+    """
+    note_details, cache_key, fallback_yaml = describe_note(
+        file_content, filename, filepath, existing_yaml, yaml_rules
+    )
+
+    # Create a detailed prompt for the OpenAI API
+    prompt = f"""Analyze the following Markdown note and generate appropriate YAML front matter that's consistent with the provided YAML rules.
+
+{note_details}
 
 TASK:
 Generate YAML front matter for this note following EXACTLY the rules provided.
 If existing YAML is present, update and improve it according to the rules.
 If there's no existing YAML, create new YAML following the rules.
 
-IMPORTANT REQUIREMENTS:
-1. Follow ALL the numbered rules provided in the YAML RULES section.
-2. Use wikilinks with double brackets for most fields as specified in the rules.
-3. Use the specified date format (YYYY-MM-DD) for all date fields.
-4. Include ALL mandatory fields (title, date_created_at, type, tags).
-5. DO NOT include any field that isn't relevant to the note's content.
-6. Follow the exact formatting patterns shown in the examples.
-7. Output ONLY the YAML content, without the triple-dash markers.
+IMPORTANT: Output only valid YAML without --- markers, following the rules exactly.
 """
 
-        # Call the OpenAI API
-        response = openai.ChatCompletion.create(
-            model="gpt-4o",  # Use GPT-4 for best results
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a specialized AI that generates YAML front matter for Obsidian Markdown notes. You strictly follow the conventions specified and only output the requested YAML content. You are an expert in Obsidian knowledge management and understand precisely how to structure metadata according to provided rules.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.2,  # Lower temperature for more consistent results
-            max_tokens=600,  # Allow for longer YAML responses
+    request_body = {
+        "model": MODEL,
+        "messages": [
+            {"role": "system", "content": build_system_message(yaml_rules)},
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.2,  # Lower temperature for more consistent results
+        "max_tokens": MAX_YAML_TOKENS,
+    }
+
+    return request_body, cache_key, fallback_yaml
+
+
+def is_valid_yaml(generated_yaml: str) -> bool:
+    """
+    Checks that generated YAML parses and contains all MANDATORY_FIELDS.
+
+    Args:
+        generated_yaml (str): YAML content returned by the model.
+
+    Returns:
+        bool: True if the YAML is usable as front matter.
+    """
+    try:
+        data = yaml.safe_load(generated_yaml)
+    except yaml.YAMLError:
+        return False
+    return isinstance(data, dict) and all(field in data for field in MANDATORY_FIELDS)
+
+
+async def generate_yaml_with_ai(
+    file_content: str,
+    filename: str,
+    filepath: str = "",
+    existing_yaml: str = "",
+    yaml_rules: str = "",
+) -> Tuple[str, bool]:
+    """
+    Generates YAML front matter content using OpenAI's API.
+
+    FAST_MODEL is tried first; if its output fails is_valid_yaml (or the
+    request fails), the note is sent again to MODEL.
+
+    Args:
+        file_content (str): The main content of the Markdown file (without YAML).
+        filename (str): The name of the file.
+        filepath (str, optional): The relative path of the file.
+        existing_yaml (str, optional): Any existing YAML in the file.
+        yaml_rules (str, optional): The YAML formatting rules.
+
+    Returns:
+        Tuple[str, bool]: (yaml_content, validated), where yaml_content is the
+        YAML without the '---' markers and validated is False when it is the
+        fallback YAML rather than a validated (or cached) response.
+    """
+    request_body, cache_key, fallback_yaml = build_yaml_request(
+        file_content, filename, filepath, existing_yaml, yaml_rules
+    )
+
+    # Return the stored YAML if these exact inputs were already sent to the API
+    cached_yaml = get_cached_yaml(cache_key)
+    if cached_yaml is not None:
+        print(f"Using cached YAML for {filename}.")
+        return cached_yaml, True
+
+    for model in (FAST_MODEL, MODEL):
+        request_body["model"] = model
+        try:
+            # Call the OpenAI API once the rate limiter has room for the request
+            await rate_limiter.acquire(estimate_request_tokens(request_body))
+            stream = await client.chat.completions.create(**request_body, stream=True)
+
+            # Collect the generated YAML content as it streams in
+            chunks = []
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    chunks.append(chunk.choices[0].delta.content)
+            generated_yaml = "".join(chunks).strip()
+        except Exception as e:
+            print(
+                f"Error calling OpenAI API ({model}) for {filename}: {e}",
+                file=sys.stderr,
+            )
+            continue
+
+        if not is_valid_yaml(generated_yaml):
+            print(f"YAML from {model} for {filename} failed validation.")
+            continue
+
+        print(f"Successfully generated YAML for {filename} via {model}.")
+
+        # Only validated responses are cached, never the fallback below
+        store_cached_yaml(cache_key, generated_yaml)
+
+        return generated_yaml, True
+
+    print(f"Using fallback YAML for {filename}")
+    return fallback_yaml, False
+
+
+async def generate_yaml_batch(
+    tasks: List[Tuple[str, str, str, str]], yaml_rules: str
+) -> Dict[str, str]:
+    """
+    Generates YAML for several notes with a single OpenAI request.
+
+    The notes are packed into one prompt and the model returns a JSON object
+    mapping each note's relative path to its YAML, so a run needs roughly
+    NOTES_PER_REQUEST times fewer requests under the account's rate limits.
+    Notes are keyed by relative path rather than filename, since filenames
+    are not unique across vault folders. Group requests use FAST_MODEL; YAML
+    that fails is_valid_yaml is left out like a missing note.
+
+    Args:
+        tasks (List[Tuple[str, str, str, str]]): (filepath, relative_path,
+            existing_yaml, main_content) for each note in the group.
+        yaml_rules (str): The YAML formatting rules.
+
+    Returns:
+        Dict[str, str]: Generated YAML keyed by relative path. Notes missing
+        from the response (or from a failed request) are left out, so the
+        caller can retry them individually.
+    """
+    results = {}
+    pending = {}  # relative_path -> (note_details, cache_key)
+
+    for filepath, relative_path, existing_yaml, main_content in tasks:
+        note_details, cache_key, _ = describe_note(
+            main_content,
+            os.path.basename(filepath),
+            relative_path,
+            existing_yaml,
+            yaml_rules,
         )
 
-        # Extract the generated YAML content
-        generated_yaml = response["choices"][0]["message"]["content"].strip()
-        print(f"Successfully generated YAML for {filename} via OpenAI.")
+        cached_yaml = get_cached_yaml(cache_key)
+        if cached_yaml is not None:
+            print(f"Using cached YAML for {relative_path}.")
+            results[relative_path] = cached_yaml
+        else:
+            pending[relative_path] = (note_details, cache_key)
 
-        return generated_yaml
+    if not pending:
+        return results
 
-    except Exception as e:
-        print(f"Error calling OpenAI API for {filename}: {e}", file=sys.stderr)
+    notes = "\n\n".join(
+        f"=== NOTE: {relative_path} ===\n{note_details}"
+        for relative_path, (note_details, _) in pending.items()
+    )
+    prompt = f"""Analyze each of the following {len(pending)} Markdown notes and generate appropriate YAML front matter for each one that's consistent with the provided YAML rules.
 
-        # Fallback to basic YAML if API call fails
-        fallback_yaml = f"""title:
-  - {title}
-date_created_at: {datetime.date.today().isoformat()}
-type:
-  - "[[Notes]]"
-tags:
-  - "#untagged"
+{notes}
+
+TASK:
+Generate YAML front matter for every note above following EXACTLY the rules provided.
+If existing YAML is present, update and improve it according to the rules.
+If there's no existing YAML, create new YAML following the rules.
+
+IMPORTANT: Return a JSON object mapping each note path given after "NOTE:" to that note's YAML as a string, valid YAML without --- markers, following the rules exactly.
 """
-        print(f"Using fallback YAML for {filename}")
-        return fallback_yaml
+
+    request_body = {
+        "model": FAST_MODEL,
+        "messages": [
+            {"role": "system", "content": build_system_message(yaml_rules)},
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.2,
+        "max_tokens": MAX_YAML_TOKENS * len(pending),
+        "response_format": {"type": "json_object"},
+    }
+
+    try:
+        await rate_limiter.acquire(estimate_request_tokens(request_body))
+        response = await client.chat.completions.create(**request_body)
+        generated = json.loads(response.choices[0].message.content)
+    except Exception as e:
+        print(
+            f"Error calling OpenAI API for {len(pending)} notes: {e}", file=sys.stderr
+        )
+        return results
+
+    if not isinstance(generated, dict):
+        print("Error: OpenAI returned a non-object JSON response", file=sys.stderr)
+        return results
+
+    for relative_path, (_, cache_key) in pending.items():
+        generated_yaml = generated.get(relative_path)
+        if isinstance(generated_yaml, str) and is_valid_yaml(generated_yaml):
+            generated_yaml = generated_yaml.strip()
+            print(f"Successfully generated YAML for {relative_path} via {FAST_MODEL}.")
+            results[relative_path] = generated_yaml
+            store_cached_yaml(cache_key, generated_yaml)
+
+    return results
+
+
+# --- OpenAI Batch API ---
+
+# JSONL file of requests uploaded to the Batch API
+BATCH_REQUESTS_PATH = os.path.join(script_dir, ".yaml_batch_requests.jsonl")
+
+# Seconds to wait between batch status checks
+BATCH_POLL_INTERVAL = 30
+
+# Batch statuses after which the job will not progress any further
+BATCH_FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+async def generate_yaml_with_batch_api(
+    tasks: List[Tuple[str, str, str, str]], yaml_rules: str
+) -> Dict[str, Tuple[str, bool]]:
+    """
+    Generates YAML for many notes in one OpenAI Batch API job.
+
+    Cached notes are answered locally; all other requests are written to a
+    JSONL file, uploaded once, and the batch is polled until it finishes.
+    The Batch API costs half as much as regular requests and has its own
+    rate-limit pool, at the price of up to 24 hours of latency.
+
+    Args:
+        tasks (List[Tuple[str, str, str, str]]): (filepath, relative_path,
+            existing_yaml, main_content) for every note to process.
+        yaml_rules (str): The YAML formatting rules.
+
+    Returns:
+        Dict[str, Tuple[str, bool]]: (yaml_content, validated) keyed by relative
+        path. Notes whose request failed get their fallback YAML with
+        validated set to False.
+    """
+    results = {}
+    pending = {}  # relative_path -> (cache_key, fallback_yaml)
+
+    with open(BATCH_REQUESTS_PATH, "w", encoding="utf-8") as f:
+        for filepath, relative_path, existing_yaml, main_content in tasks:
+            request_body, cache_key, fallback_yaml = build_yaml_request(
+                main_content,
+                os.path.basename(filepath),
+                relative_path,
+                existing_yaml,
+                yaml_rules,
+            )
+
+            cached_yaml = get_cached_yaml(cache_key)
+            if cached_yaml is not None:
+                print(f"Using cached YAML for {relative_path}.")
+                results[relative_path] = (cached_yaml, True)
+                continue
+
+            pending[relative_path] = (cache_key, fallback_yaml)
+            request = {
+                "custom_id": relative_path,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": request_body,
+            }
+            f.write(json.dumps(request) + "\n")
+
+    if not pending:
+        return results
+
+    # Upload the requests and start the batch job
+    with open(BATCH_REQUESTS_PATH, "rb") as f:
+        batch_file = await client.files.create(file=f, purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    print(f"Submitted batch {batch.id} with {len(pending)} requests.")
+
+    while batch.status not in BATCH_FINAL_STATUSES:
+        await asyncio.sleep(BATCH_POLL_INTERVAL)
+        batch = await client.batches.retrieve(batch.id)
+        print(f"  Batch {batch.id} status: {batch.status}")
+
+    if batch.status == "completed" and batch.output_file_id:
+        output = await client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            relative_path = record["custom_id"]
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                print(
+                    f"Error in batch response for {relative_path}: {record.get('error')}",
+                    file=sys.stderr,
+                )
+                continue
+
+            generated_yaml = response["body"]["choices"][0]["message"][
+                "content"
+            ].strip()
+            if not is_valid_yaml(generated_yaml):
+                print(f"YAML from {MODEL} for {relative_path} failed validation.")
+                continue
+            results[relative_path] = (generated_yaml, True)
+            store_cached_yaml(pending[relative_path][0], generated_yaml)
+    else:
+        print(
+            f"Error: batch {batch.id} finished with status '{batch.status}'",
+            file=sys.stderr,
+        )
+
+    # Fall back to basic YAML for every request without a usable response
+    for relative_path, (_, fallback_yaml) in pending.items():
+        if relative_path not in results:
+            print(f"Using fallback YAML for {relative_path}")
+            results[relative_path] = (fallback_yaml, False)
+
+    return results
 
 
 # --- Main Script Logic ---
 
 
-def process_all_markdown_files(root_dir: str):
+def iter_markdown_files(root_dir: str, skip_dirs: Set[str]) -> Iterator[str]:
+    """
+    Recursively yields the paths of all Markdown files under a directory.
+
+    Uses os.scandir so file and directory checks come from the cached directory
+    entries instead of extra stat calls.
+
+    Args:
+        root_dir (str): The directory to scan.
+        skip_dirs (Set[str]): Absolute directory paths that are not descended into.
+
+    Yields:
+        str: Path of each Markdown file found.
+    """
+    try:
+        entries = os.scandir(root_dir)
+    except OSError as e:
+        # Unreadable directories are skipped, as os.walk did
+        print(f"Warning: Could not read directory {root_dir}: {e}", file=sys.stderr)
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.path not in skip_dirs:
+                    yield from iter_markdown_files(entry.path, skip_dirs)
+            elif entry.name.lower().endswith(".md") and entry.is_file():
+                yield entry.path
+
+
+async def process_all_markdown_files(
+    root_dir: str,
+    use_batch: bool = False,
+    max_size_kb: Optional[int] = None,
+    force: bool = False,
+):
     """
     Scans a directory for ALL Markdown files and updates their YAML front matter.
 
+    Files are collected with a synchronous directory walk first; the OpenAI
+    requests are then issued concurrently, bounded by MAX_CONCURRENT_REQUESTS
+    and paced by rate_limiter to stay under the account's rate limits, or
+    submitted as one Batch API job.
+
     Args:
         root_dir (str): The root directory to scan (the Obsidian vault path).
+        use_batch (bool): Whether to use the OpenAI Batch API instead of live requests.
+        max_size_kb (Optional[int]): Notes larger than this (in KB) are skipped without
+            being read. None processes notes of any size.
+        force (bool): Process notes even if they are unchanged since the last run.
     """
     files_modified = []
     files_skipped = []
     files_error = []
+    files_unchanged = []
 
     abs_root_dir = os.path.abspath(root_dir)
     print(f"Scanning directory for Markdown files: {abs_root_dir}")
@@ -346,64 +957,167 @@ def process_all_markdown_files(root_dir: str):
         print("Warning: YAML rules could not be loaded. Using default rules.")
         yaml_rules = "Use standard YAML formatting with wikilinks in double brackets and dates in YYYY-MM-DD format."
 
-    # Exclude the script's own directory
-    script_dir = os.path.abspath(os.path.dirname(__file__))
+    # Exclude the script's own directory (module-level script_dir)
+    skip_dirs = {script_dir}
 
     # Find the rules file to exclude it from processing
-    rules_file = os.path.join(abs_root_dir, "How to write YAML in Obsidian.md")
-    rules_file_abs = os.path.abspath(rules_file)
+    rules_file_abs = os.path.join(abs_root_dir, "How to write YAML in Obsidian.md")
 
-    for subdir, _, files in os.walk(abs_root_dir):
-        # Skip the script directory itself
-        if os.path.abspath(subdir).startswith(script_dir):
+    # Hashes of notes as they were last written by this script
+    state = load_state(STATE_PATH)
+
+    # Collect (filepath, relative_path, existing_yaml, main_content) for every note
+    tasks = []
+    for filepath in iter_markdown_files(abs_root_dir, skip_dirs):
+        # Skip the YAML rules file itself
+        if filepath == rules_file_abs:
+            print(f"Skipping YAML rules file: {os.path.basename(filepath)}")
             continue
 
-        for filename in files:
-            if filename.lower().endswith(".md"):
-                filepath = os.path.join(subdir, filename)
-                abs_filepath = os.path.abspath(filepath)
+        relative_path = os.path.relpath(filepath, abs_root_dir)
 
-                # Skip the YAML rules file itself
-                if abs_filepath == rules_file_abs:
-                    print(f"Skipping YAML rules file: {filename}")
+        print(f"Processing: {relative_path}")
+        try:
+            # Skip oversized notes before reading them, if a limit was given
+            if max_size_kb is not None:
+                file_size_kb = os.path.getsize(filepath) / 1024
+                if file_size_kb > max_size_kb:
+                    print(f"  -> Skipping large file ({file_size_kb:.1f} KB)")
+                    files_skipped.append(relative_path)
                     continue
 
-                relative_path = os.path.relpath(filepath, abs_root_dir)
-
-                print(f"Processing: {relative_path}")
+            with open(filepath, "rb") as f:
+                raw = f.read()
+
+            # Skip notes that are byte-for-byte what the last run wrote
+            if (
+                not force
+                and state.get(relative_path) == hashlib.sha256(raw).hexdigest()
+            ):
+                print("  -> Unchanged since last run")
+                files_unchanged.append(relative_path)
+                continue
+
+            # Extract existing YAML and main content
+            existing_yaml, main_content = extract_content_parts(raw.decode("utf-8"))
+
+            # Create a backup of the file
+            if not create_backup(filepath):
+                print(f"  -> Skipping {relative_path} (backup failed)")
+                files_skipped.append(relative_path)
+                continue
+
+            tasks.append((filepath, relative_path, existing_yaml, main_content))
+
+        except Exception as e:
+            print(f"Error processing file {filepath}: {e}", file=sys.stderr)
+            files_error.append(relative_path)
+
+    # Finished notes are written by a background thread, so disk I/O does not
+    # block the event loop while other requests are in flight
+    write_queue: "queue.Queue[Optional[Tuple[str, str, str, bool]]]" = queue.Queue()
+
+    def writer():
+        """Write queued (filepath, relative_path, new_content, validated) items until the None sentinel."""
+        while True:
+            item = write_queue.get()
+            try:
+                if item is None:
+                    return
+                filepath, relative_path, new_content, validated = item
                 try:
-                    # Extract existing YAML and main content
-                    existing_yaml, main_content = extract_content_parts(filepath)
-
-                    # Create a backup of the file
-                    if not create_backup(filepath):
-                        print(f"  -> Skipping {relative_path} (backup failed)")
-                        files_skipped.append(relative_path)
-                        continue
-
-                    # Generate new YAML using AI
-                    yaml_content = generate_yaml_with_ai(
-                        main_content, filename, relative_path, existing_yaml, yaml_rules
-                    )
-
-                    if yaml_content:
-                        # Create new file content with updated YAML
-                        new_content = (
-                            f"---\n{yaml_content.strip()}\n---\n\n{main_content}"
-                        )
-
-                        # Write back to the file
-                        with open(filepath, "w", encoding="utf-8") as f:
-                            f.write(new_content)
-                        files_modified.append(relative_path)
-                        print(f"  -> Updated YAML for {relative_path}")
+                    write_file_atomically(filepath, new_content)
+                    # Only validated YAML marks a note as done; notes given the
+                    # fallback YAML are picked up again on the next run
+                    if validated:
+                        state[relative_path] = hashlib.sha256(
+                            new_content.encode("utf-8")
+                        ).hexdigest()
                     else:
-                        print(f"  -> Skipped {relative_path} (failed to generate YAML)")
-                        files_skipped.append(relative_path)
-
+                        state.pop(relative_path, None)
+                    files_modified.append(relative_path)
+                    print(f"  -> Updated YAML for {relative_path}")
                 except Exception as e:
                     print(f"Error processing file {filepath}: {e}", file=sys.stderr)
                     files_error.append(relative_path)
+            finally:
+                write_queue.task_done()
+
+    threading.Thread(target=writer, daemon=True).start()
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def bounded(coro):
+        """Run a request coroutine once a concurrency slot is free."""
+        async with semaphore:
+            return await coro
+
+    def apply_yaml(task, yaml_content, validated):
+        """Queue the note with its generated YAML for writing, or record the skip."""
+        filepath, relative_path, _, main_content = task
+        if yaml_content:
+            # Create new file content with updated YAML
+            new_content = f"---\n{yaml_content.strip()}\n---\n\n{main_content}"
+
+            # Hand the write to the writer thread
+            write_queue.put((filepath, relative_path, new_content, validated))
+        else:
+            print(f"  -> Skipped {relative_path} (failed to generate YAML)")
+            files_skipped.append(relative_path)
+
+    async def handle(task):
+        filepath, relative_path, existing_yaml, main_content = task
+        try:
+            # Generate new YAML using AI
+            yaml_content, validated = await generate_yaml_with_ai(
+                main_content,
+                os.path.basename(filepath),
+                relative_path,
+                existing_yaml,
+                yaml_rules,
+            )
+        except Exception as e:
+            print(f"Error processing file {filepath}: {e}", file=sys.stderr)
+            files_error.append(relative_path)
+            return
+
+        apply_yaml(task, yaml_content, validated)
+
+    async def handle_group(group):
+        """Generate YAML for a group of notes in one request, retrying misses one by one."""
+        try:
+            results = await generate_yaml_batch(group, yaml_rules)
+        except Exception as e:
+            print(f"Error generating YAML for a group of notes: {e}", file=sys.stderr)
+            results = {}
+
+        for task in group:
+            if task[1] in results:
+                apply_yaml(task, results[task[1]], True)
+            else:
+                print(f"  -> No YAML for {task[1]} in the group response, retrying")
+                await handle(task)
+
+    if use_batch:
+        print(f"\nGenerating YAML for {len(tasks)} files via the Batch API...")
+        results = await generate_yaml_with_batch_api(tasks, yaml_rules)
+        for task in tasks:
+            apply_yaml(task, *results.get(task[1], ("", False)))
+    else:
+        print(
+            f"\nGenerating YAML for {len(tasks)} files "
+            f"({NOTES_PER_REQUEST} notes per request, "
+            f"{MAX_CONCURRENT_REQUESTS} concurrent requests)..."
+        )
+        remaining = iter(tasks)
+        groups = iter(lambda: list(itertools.islice(remaining, NOTES_PER_REQUEST)), [])
+        await asyncio.gather(*(bounded(handle_group(group)) for group in groups))
+
+    # Stop the writer thread once every queued note is on disk
+    write_queue.put(None)
+    write_queue.join()
+
+    save_state(STATE_PATH, state)
 
     print("\n--- Update Complete ---")
     print(f"Files modified: {len(files_modified)}")
@@ -411,7 +1125,11 @@ def process_all_markdown_files(root_dir: str):
         for file in sorted(files_modified):
             print(f"- {file}")
 
-    print(f"\nFiles skipped (YAML generation failed): {len(files_skipped)}")
+    print(f"\nFiles unchanged since last run: {len(files_unchanged)}")
+
+    print(
+        f"\nFiles skipped (too large, backup or YAML generation failed): {len(files_skipped)}"
+    )
     if files_skipped:
         for file in sorted(files_skipped):
             print(f"- {file}")
@@ -424,6 +1142,32 @@ def process_all_markdown_files(root_dir: str):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate or update YAML front matter for all notes using OpenAI."
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached responses and call the OpenAI API for every file",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit all requests as one OpenAI Batch API job (50%% cheaper, up to 24h)",
+    )
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=None,
+        help="Skip notes larger than this many KB (default: process every note)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Process every note, even those unchanged since the last run",
+    )
+    args = parser.parse_args()
+
     # Determine vault root based on script location
     script_location = os.path.dirname(os.path.abspath(__file__))
     vault_root = os.path.dirname(
@@ -439,6 +1183,12 @@ if __name__ == "__main__":
     confirm = input("Are you sure you want to proceed? (yes/no): ")
 
     if confirm.lower() == "yes":
-        process_all_markdown_files(vault_root)
+        if not args.no_cache:
+            yaml_cache = open_yaml_cache(CACHE_PATH)
+        asyncio.run(
+            process_all_markdown_files(
+                vault_root, args.batch, args.max_size, args.force
+            )
+        )
     else:
         print("Operation cancelled.")
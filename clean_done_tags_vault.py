@@ -10,11 +10,15 @@ It handles two formats:
 The script preserves the rest of the content while removing these tags.
 
 ## Technical Implementation
-- Uses recursive globbing to find all Markdown (.md) files in the vault
+- Uses an os.scandir-based recursive walk to find all Markdown (.md) files in the vault
 - Applies regex pattern matching to identify and remove both formats of #done tags
-- Creates backups of modified files with .backup extension
+- Creates backups of modified files with .backup extension (hardlinks where possible;
+  files are rewritten via a temporary file and os.replace so backups keep the original)
 - Generates a summary report of changes made
 - Handles different text encodings to maximize compatibility
+- Processes files in a thread pool, since the work is dominated by file I/O
+- Records a SHA-256 of each file it has handled in .done_state.json (next to the
+  script) and skips files whose content has not changed since
 
 ## Usage
 Run this script from the command line with:
@@ -24,31 +28,149 @@ Optional flags:
     --dry-run: Preview changes without modifying files
     --no-backup: Skip creating backup files (not recommended)
     --verbose: Show detailed debugging information
+    --force: Check every file, even those unchanged since the last run
 
 ## Dependencies
 - os: For file operations and path handling
 - re: For regular expression pattern matching
-- glob: For finding files recursively
+- json, hashlib: For the state file of content hashes
+- shutil: For copying backups where hardlinks are unavailable
 - argparse: For command-line argument parsing
+- concurrent.futures: For processing files in parallel threads
 """
 
 import os
 import re
-import glob
+import json
+import shutil
+import hashlib
 import argparse
+import concurrent.futures
 from datetime import datetime
 
 # Define the root directory of your Obsidian vault
 VAULT_PATH = "/Users/danildanilov/Obsidian"
 
-# Two patterns: one for #done with parentheses, one for standalone #done
-DONE_WITH_PARENS_PATTERN = r"#done\s*\([^)]*\)"
-DONE_STANDALONE_PATTERN = (
-    r"#done\b(?!\s*\()"  # Matches #done not followed by parentheses
+# Number of threads used to process files in parallel
+MAX_WORKERS = 16
+
+# JSON map of relative path -> SHA-256 of files already cleaned (or checked and found
+# to need no changes); files whose content still matches are skipped next run
+STATE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".done_state.json"
 )
 
+# Compiled once: #done with parentheses, or a standalone #done not followed by
+# parentheses, so every tag is found and removed in a single pass
+DONE_RE = re.compile(r"#done\s*\([^)]*\)|#done\b(?!\s*\()")
+
+
+def iter_markdown_files(root_dir):
+    """
+    Recursively yield the paths of all Markdown files below a directory.
+
+    Uses os.scandir so type checks come from the cached directory entry instead
+    of extra stat calls. Hidden files and directories (e.g. .obsidian, .trash)
+    are skipped, matching the previous recursive glob.
+
+    Args:
+        root_dir (str): Directory to scan
+
+    Yields:
+        str: Path of each markdown file found
+    """
+    try:
+        entries = os.scandir(root_dir)
+    except OSError as e:
+        # Unreadable directories are skipped, as the recursive glob did
+        print(f"Warning: Could not read directory {root_dir}: {e}")
+        return
+    with entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_markdown_files(entry.path)
+            elif entry.name.endswith(".md") and entry.is_file():
+                yield entry.path
+
+
+def link_backup(file_path, backup_path):
+    """
+    Create a backup of a file as a hardlink, falling back to a copy.
+
+    A hardlink shares the original's data, so no bytes are written. This is
+    only safe because files are rewritten with replace_file_content, which
+    swaps in a new inode instead of writing into the linked one.
+
+    Args:
+        file_path (str): Path to the file to back up
+        backup_path (str): Path of the backup to create
+    """
+    # Replace any backup left over from a previous run
+    if os.path.lexists(backup_path):
+        os.remove(backup_path)
+    try:
+        os.link(file_path, backup_path)
+    except OSError:
+        # Hardlinks unsupported (cross-device, some synced/network filesystems);
+        # copyfile uses the kernel copy fast path (sendfile/fcopyfile) where available
+        shutil.copyfile(file_path, backup_path)
+        shutil.copystat(file_path, backup_path)
+
+
+def replace_file_content(file_path, content, encoding):
+    """
+    Replace a file's content by writing a temporary file and renaming it over
+    the original with os.replace.
 
-def clean_done_tags(file_path, create_backup=True, dry_run=False, verbose=False):
+    Args:
+        file_path (str): Path to the file to overwrite
+        content (str): New file content
+        encoding (str): Text encoding to write with
+    """
+    tmp_path = file_path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding=encoding, newline="") as file:
+            file.write(content)
+        shutil.copymode(file_path, tmp_path)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_state():
+    """
+    Load the relative path -> SHA-256 map saved by the previous run.
+
+    Returns:
+        dict: The stored hashes, or an empty dict if there is no usable state file
+    """
+    try:
+        with open(STATE_PATH, "r", encoding="utf-8") as file:
+            state = json.load(file)
+        return state if isinstance(state, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Warning: Could not read state file {STATE_PATH}: {str(e)}")
+        return {}
+
+
+def save_state(state):
+    """Save the relative path -> SHA-256 map for the next run."""
+    try:
+        with open(STATE_PATH, "w", encoding="utf-8") as file:
+            json.dump(state, file, indent=2, sort_keys=True)
+    except Exception as e:
+        print(f"Warning: Could not save state file {STATE_PATH}: {str(e)}")
+
+
+def clean_done_tags(
+    file_path, create_backup=True, dry_run=False, verbose=False, state=None, force=False
+):
     """
     Remove #done tags from a file.
 
@@ -57,124 +179,82 @@ def clean_done_tags(file_path, create_backup=True, dry_run=False, verbose=False)
         create_backup (bool): Whether to create a backup of the original file
         dry_run (bool): If True, only simulate changes without writing to files
         verbose (bool): If True, print detailed debugging information
+        state (dict): Relative path -> SHA-256 of files handled by earlier runs;
+            updated in place (dict assignment is safe across worker threads)
+        force (bool): If True, ignore the stored hashes and check every file
+
+    Output is collected rather than printed so the function can run in a
+    worker thread; the caller prints the returned messages in file order.
 
     Returns:
-        tuple: (bool indicating if file was modified, int count of tags removed)
+        tuple: (bool indicating if file was modified, int count of tags removed,
+                list of messages to print)
     """
+    messages = []
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            content = file.read()
+        # Read the file once; decoding falls back to latin-1 in memory
+        with open(file_path, "rb") as file:
+            raw = file.read()
+
+        # Most notes have no #done tag at all; a byte substring check skips
+        # decoding and the regex for them ("#done" is ASCII in either encoding)
+        if b"#done" not in raw:
+            return False, 0, messages
+
+        # Files that still contain "#done" but were already handled (e.g. only
+        # "#doneish"-style text that is not a tag) are skipped by content hash
+        rel_path = os.path.relpath(file_path, VAULT_PATH)
+        content_hash = hashlib.sha256(raw).hexdigest()
+        if state is not None and not force and state.get(rel_path) == content_hash:
+            return False, 0, messages
 
-        if verbose and "#done" in content:
-            rel_path = os.path.relpath(file_path, VAULT_PATH)
-            print(f"\nDEBUG: Found '#done' in {rel_path}")
+        try:
+            content = raw.decode("utf-8")
+            encoding = "utf-8"
+        except UnicodeDecodeError:
+            content = raw.decode("latin-1")
+            encoding = "latin-1"
 
-        # Count regex pattern matches for both types
-        matches_with_parens = re.findall(DONE_WITH_PARENS_PATTERN, content)
-        matches_standalone = re.findall(DONE_STANDALONE_PATTERN, content)
+        if verbose and "#done" in content:
+            messages.append(f"\nDEBUG: Found '#done' in {rel_path}")
 
-        total_matches = matches_with_parens + matches_standalone
-        tag_count = len(total_matches)
+        # Remove both kinds of #done tags in a single pass
+        modified_content, tag_count = DONE_RE.subn("", content)
 
         if verbose and tag_count > 0:
-            print(f"  - Found {len(matches_with_parens)} #done tags with parentheses")
-            print(f"  - Found {len(matches_standalone)} standalone #done tags")
-            for match in total_matches:
-                print(f"    - '{match}'")
+            messages.append(f"  - Found {tag_count} #done tags")
+            for match in DONE_RE.findall(content):
+                messages.append(f"    - '{match}'")
 
         if tag_count == 0:
-            return False, 0
-
-        # Replace #done tags - first those with parentheses, then standalone
-        modified_content = content
-        for match in matches_with_parens:
-            modified_content = modified_content.replace(match, "")
-
-        # For standalone #done, we need to be more careful to avoid removing part of other text
-        for match in matches_standalone:
-            # Make sure we only replace exact standalone #done tags (with word boundary)
-            modified_content = re.sub(
-                r"\b" + re.escape(match) + r"\b", "", modified_content
-            )
-
-        # Double-check if content was modified
-        if content != modified_content:
-            if not dry_run:
-                # Create backup if requested
-                if create_backup:
-                    backup_path = file_path + ".backup"
-                    with open(backup_path, "w", encoding="utf-8") as backup_file:
-                        backup_file.write(content)
-
-                # Write modified content
-                with open(file_path, "w", encoding="utf-8") as file:
-                    file.write(modified_content)
-
-                # Report modification
-                print(
-                    f"Modified: {os.path.relpath(file_path, VAULT_PATH)} - removed {tag_count} tags"
-                )
-
-            return True, tag_count
-        else:
-            # This shouldn't happen if we found matches but is a good safety check
-            if tag_count > 0:
-                print(
-                    f"Warning: Found {tag_count} tags in {os.path.relpath(file_path, VAULT_PATH)} but content was not modified"
-                )
-            return False, 0
-
-    except UnicodeDecodeError:
-        # Try with a different encoding if UTF-8 fails
-        try:
-            with open(file_path, "r", encoding="latin-1") as file:
-                content = file.read()
+            if state is not None and not dry_run:
+                state[rel_path] = content_hash
+            return False, 0, messages
 
-            # Repeat the pattern matching and replacement with this encoding
-            matches_with_parens = re.findall(DONE_WITH_PARENS_PATTERN, content)
-            matches_standalone = re.findall(DONE_STANDALONE_PATTERN, content)
+        if not dry_run:
+            # Create backup if requested
+            if create_backup:
+                link_backup(file_path, file_path + ".backup")
 
-            total_matches = matches_with_parens + matches_standalone
-            tag_count = len(total_matches)
+            # Write modified content back in the encoding it was read with
+            replace_file_content(file_path, modified_content, encoding)
+            if state is not None:
+                state[rel_path] = hashlib.sha256(
+                    modified_content.encode(encoding)
+                ).hexdigest()
 
-            if tag_count == 0:
-                return False, 0
+            # Report modification
+            label = "Modified" if encoding == "utf-8" else f"Modified ({encoding})"
+            messages.append(f"{label}: {rel_path} - removed {tag_count} tags")
 
-            modified_content = content
-            for match in matches_with_parens:
-                modified_content = modified_content.replace(match, "")
+        return True, tag_count, messages
 
-            for match in matches_standalone:
-                modified_content = re.sub(
-                    r"\b" + re.escape(match) + r"\b", "", modified_content
-                )
-
-            if content != modified_content:
-                if not dry_run:
-                    if create_backup:
-                        backup_path = file_path + ".backup"
-                        with open(backup_path, "w", encoding="latin-1") as backup_file:
-                            backup_file.write(content)
-
-                    with open(file_path, "w", encoding="latin-1") as file:
-                        file.write(modified_content)
-
-                    print(
-                        f"Modified (latin-1): {os.path.relpath(file_path, VAULT_PATH)} - removed {tag_count} tags"
-                    )
-
-                return True, tag_count
-            return False, 0
-
-        except Exception as e:
-            print(f"Error processing {file_path} with alternate encoding: {str(e)}")
-            return False, 0
     except Exception as e:
-        print(f"Error processing {file_path}: {str(e)}")
-        return False, 0
+        messages.append(f"Error processing {file_path}: {str(e)}")
+        return False, 0, messages
 
 
-def process_vault(create_backup=True, dry_run=False, verbose=False):
+def process_vault(create_backup=True, dry_run=False, verbose=False, force=False):
     """
     Process all markdown files in the vault.
 
@@ -182,12 +262,16 @@ def process_vault(create_backup=True, dry_run=False, verbose=False):
         create_backup (bool): Whether to create backups of modified files
         dry_run (bool): If True, only simulate changes without writing to files
         verbose (bool): If True, print detailed debugging information
+        force (bool): If True, check files even if unchanged since the last run
 
     Returns:
         tuple: (list of modified files, total tags removed, total files processed)
     """
     # Find all markdown files
-    md_files = glob.glob(f"{VAULT_PATH}/**/*.md", recursive=True)
+    md_files = list(iter_markdown_files(VAULT_PATH))
+
+    # Hashes of files handled by previous runs
+    state = load_state()
 
     modified_files = []
     total_tags_removed = 0
@@ -200,9 +284,8 @@ def process_vault(create_backup=True, dry_run=False, verbose=False):
         sample_files = []
         for file_path in md_files:
             try:
-                with open(file_path, "r", encoding="utf-8") as file:
-                    content = file.read()
-                    if "#done" in content:
+                with open(file_path, "rb") as file:
+                    if b"#done" in file.read():
                         sample_files.append(file_path)
                         if len(sample_files) >= 5:  # Limit to 5 examples
                             break
@@ -218,17 +301,31 @@ def process_vault(create_backup=True, dry_run=False, verbose=False):
         else:
             print("\nWARNING: No files containing '#done' string were found!")
 
-    for i, file_path in enumerate(md_files):
-        # Progress indicator for large vaults
-        if i % 100 == 0:
-            print(f"Processing file {i+1}/{file_count}...")
-
-        was_modified, tags_removed = clean_done_tags(
-            file_path, create_backup, dry_run, verbose
+    # Files are read, cleaned, and written by a pool of threads (the work is
+    # I/O-bound); results come back in file order and are printed from here
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = executor.map(
+            lambda path: clean_done_tags(
+                path, create_backup, dry_run, verbose, state, force
+            ),
+            md_files,
         )
-        if was_modified:
-            modified_files.append((file_path, tags_removed))
-            total_tags_removed += tags_removed
+        for i, (file_path, (was_modified, tags_removed, messages)) in enumerate(
+            zip(md_files, results)
+        ):
+            # Progress indicator for large vaults
+            if i % 100 == 0:
+                print(f"Processing file {i+1}/{file_count}...")
+
+            for message in messages:
+                print(message)
+
+            if was_modified:
+                modified_files.append((file_path, tags_removed))
+                total_tags_removed += tags_removed
+
+    if not dry_run:
+        save_state(state)
 
     return modified_files, total_tags_removed, len(md_files)
 
@@ -247,6 +344,11 @@ def main():
     parser.add_argument(
         "--verbose", action="store_true", help="Show detailed debugging information"
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Check every file, even those unchanged since the last run",
+    )
     args = parser.parse_args()
 
     create_backup = not args.no_backup
@@ -256,13 +358,11 @@ def main():
     )
     print(f"Vault path: {VAULT_PATH}")
     print(f"Creating backups: {'No' if args.no_backup else 'Yes'}")
-    print(
-        f"Patterns used: \n  1. {DONE_WITH_PARENS_PATTERN} (with parentheses)\n  2. {DONE_STANDALONE_PATTERN} (standalone)"
-    )
+    print(f"Pattern used: {DONE_RE.pattern}")
 
     start_time = datetime.now()
     modified_files, total_tags_removed, total_files = process_vault(
-        create_backup, args.dry_run, args.verbose
+        create_backup, args.dry_run, args.verbose, args.force
     )
     end_time = datetime.now()
 
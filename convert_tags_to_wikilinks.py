@@ -7,21 +7,37 @@ It allows for targeted conversion of individual tags or tag patterns based on
 your conversion plan.
 
 ## Technical Implementation
-- Uses recursive globbing to find all Markdown (.md) files in the vault
+- Walks the vault with os.scandir to find all Markdown (.md) files, skipping
+  hidden and ignored directories
 - Replaces specified tags with corresponding wikilinks
-- Creates backups of modified files
+- In --tag-map mode, matches all tags with one combined regex, so each file is
+  scanned once no matter how many tags are converted
+- Creates backups of modified files (hardlinks where possible; files are
+  rewritten via a temporary file and os.replace so backups keep the original)
+- Checks files for the tag in a thread pool (I/O-bound), then converts only the
+  matching files in a pool of worker processes (one per CPU core), since the
+  regex work is CPU-bound
+- Buffers progress output and writes it in batches
 - Generates a summary report of changes made
-- Handles YAML frontmatter appropriately
+- Handles YAML frontmatter appropriately; with --convert-yaml, frontmatter tags
+  are parsed with PyYAML and moved into a related: list of wikilinks
 
 ## Usage
 Run this script from the command line with:
     python convert_tags_to_wikilinks.py --tag "#tag/to/convert" --wikilink "Replacement Note"
 
-Required arguments:
+To convert many tags in a single pass over the vault, pass a JSON file mapping
+tags to note names instead:
+    python convert_tags_to_wikilinks.py --tag-map conversion_plan.json
+
+    {"#tag/one": "Note One", "#tag/two": "Note Two"}
+
+Required arguments (unless --tag-map is used):
     --tag: The tag to convert (include the # prefix)
     --wikilink: The note name to use in the wikilink (without [[]])
 
 Optional flags:
+    --tag-map: JSON file mapping tags to note names, converted in one pass
     --dry-run: Preview changes without modifying files
     --no-backup: Skip creating backup files
     --convert-yaml: Also convert tags in YAML frontmatter to wikilinks
@@ -30,24 +46,497 @@ Optional flags:
 ## Dependencies
 - os: For file operations and path handling
 - re: For regular expression pattern matching
-- glob: For finding files recursively
+- sys: For writing buffered progress output
 - argparse: For command-line argument parsing
+- json: For reading the --tag-map file
+- mmap: For searching files for the tag without reading and decoding them
+- shutil: For copying backups where hardlinks are unavailable
+- functools: For binding conversion options to the per-file function
+- concurrent.futures: For checking files for the tag in parallel threads
+- multiprocessing: For converting files in parallel worker processes
+- yaml (PyYAML, optional): For parsing frontmatter tags with --convert-yaml
 """
 
 import os
 import re
-import glob
+import sys
+import json
+import mmap
+import shutil
 import argparse
-from datetime import datetime
+import functools
+import concurrent.futures
+import multiprocessing
+import time
+
+# PyYAML is only needed for --convert-yaml: pip install pyyaml
+try:
+    import yaml  # type: ignore
+
+    # The C (libyaml) loader and dumper are several times faster when available
+    YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+except ImportError:
+    yaml = None
 
 # Define the root directory of your Obsidian vault
 VAULT_PATH = "/Users/danildanilov/Obsidian"
 
+# Directories that are never searched for notes (hidden directories such as
+# .git, .obsidian and .trash are always skipped)
+IGNORED_DIRS = {"node_modules", "__pycache__"}
+
+# Number of threads checking files for the tag before conversion
+PREFILTER_WORKERS = 32
+
+# Progress and per-file messages are buffered and written once every this many files
+OUTPUT_FLUSH_INTERVAL = 500
+
+# Separator between tags written as one string in frontmatter (tags: a, b c)
+YAML_TAG_SEPARATOR_RE = re.compile(r"[,\s]+")
+
+
+def iter_markdown_files(root_dir, ignored_dirs):
+    """
+    Recursively yield the paths of all Markdown files below a directory.
+
+    Uses os.scandir so type checks come from the cached directory entries, and
+    prunes ignored and hidden directories (.git, .obsidian, .trash) instead of
+    descending into them. Hidden files are skipped, like the recursive glob did.
+
+    Args:
+        root_dir (str): Directory to scan
+        ignored_dirs (set): Directory names that are not descended into
+
+    Yields:
+        str: Path of each markdown file found
+    """
+    try:
+        entries = os.scandir(root_dir)
+    except OSError as e:
+        # Unreadable directories are skipped, as the recursive glob did
+        print(f"Warning: Could not read directory {root_dir}: {e}")
+        return
+    with entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in ignored_dirs:
+                    yield from iter_markdown_files(entry.path, ignored_dirs)
+            elif entry.name.endswith(".md") and entry.is_file():
+                yield entry.path
+
+
+def compile_tag_pattern(tag, exact_match=False):
+    """
+    Compile the regex that matches a tag in note bodies.
+
+    Args:
+        tag (str): The tag to convert (with # prefix)
+        exact_match (bool): Only match the exact tag, not nested tags
+
+    Returns:
+        re.Pattern: The compiled tag pattern
+    """
+    if exact_match:
+        # Exact match pattern
+        return re.compile(r"(?<!\w)" + re.escape(tag) + r"(?!\w)")
+    # Also match nested tags that start with this tag
+    return re.compile(r"(?<!\w)" + re.escape(tag) + r"(?:/[a-zA-Z0-9_.-]+)*(?!\w)")
+
+
+def compile_tag_map_pattern(tag_map, exact_match=False):
+    """
+    Compile one regex that matches every tag in a tag map.
+
+    Tags are tried longest first, so a nested tag listed in the map (e.g.
+    #proj/sub) wins over its parent (#proj). The matched tag from the map is
+    captured in group 1.
+
+    Args:
+        tag_map (dict): Tags (with # prefix) mapped to note names
+        exact_match (bool): Only match the exact tags, not nested tags
+
+    Returns:
+        re.Pattern: The compiled pattern
+    """
+    alternation = "|".join(
+        re.escape(tag) for tag in sorted(tag_map, key=len, reverse=True)
+    )
+    nested = "" if exact_match else r"(?:/[a-zA-Z0-9_.-]+)*"
+    return re.compile(r"(?<!\w)(" + alternation + ")" + nested + r"(?!\w)")
+
+
+def is_word_char(char):
+    """Return True if char is a regex word character (\\w)."""
+    return char.isalnum() or char == "_"
+
+
+def replace_exact_tag(text, tag, replacement):
+    """
+    Replace exact occurrences of a tag, without using the regex engine.
+
+    Equivalent to substituting the exact-match pattern from compile_tag_pattern:
+    occurrences are found with str.find and kept only if they are not preceded
+    or followed by a word character.
+
+    Args:
+        text (str): Text to convert
+        tag (str): The tag to replace (with # prefix)
+        replacement (str): Text to put in place of each occurrence
+
+    Returns:
+        tuple: (converted text, int count of replacements)
+    """
+    parts = []
+    count = 0
+    last_end = 0
+    tag_length = len(tag)
+
+    start = text.find(tag)
+    while start != -1:
+        end = start + tag_length
+        if (start == 0 or not is_word_char(text[start - 1])) and (
+            end == len(text) or not is_word_char(text[end])
+        ):
+            parts.append(text[last_end:start])
+            parts.append(replacement)
+            count += 1
+            last_end = end
+            start = text.find(tag, end)
+        else:
+            start = text.find(tag, start + 1)
+
+    if not count:
+        return text, 0
+    parts.append(text[last_end:])
+    return "".join(parts), count
+
+
+def contains_any(file_path, needles):
+    """
+    Check whether a file contains at least one of the given byte strings.
+
+    The file is memory-mapped and searched with mmap.find. Unreadable files
+    count as a match, so the conversion step reports the error.
+
+    Args:
+        file_path (str): Path to the markdown file
+        needles (list): UTF-8 encoded strings to look for
+
+    Returns:
+        bool: True if any needle was found
+    """
+    try:
+        with open(file_path, "rb") as file:
+            # Empty files cannot be memory-mapped (and contain nothing anyway)
+            if os.fstat(file.fileno()).st_size == 0:
+                return False
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return any(mapped.find(needle) != -1 for needle in needles)
+    except OSError:
+        return True
+
+
+def read_if_contains(file_path, needles):
+    """
+    Read a file only if it contains at least one of the given byte strings.
+
+    The file is memory-mapped and searched with mmap.find, so files without a
+    match (the vast majority for a typical tag) are never decoded or run
+    through the regex. The content is returned undecoded.
+
+    Args:
+        file_path (str): Path to the markdown file
+        needles (list): UTF-8 encoded strings to look for
+
+    Returns:
+        bytes: The raw file content, or None if no needle was found
+    """
+    with open(file_path, "rb") as file:
+        # Empty files cannot be memory-mapped (and contain nothing anyway)
+        if os.fstat(file.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if all(mapped.find(needle) == -1 for needle in needles):
+                return None
+            return mapped[:]
+
+
+def frontmatter_end(raw):
+    """
+    Find where the YAML frontmatter (including its delimiters) ends.
+
+    The delimiters are located on the raw bytes, so the frontmatter never has
+    to be decoded unless its tags are converted ("---" is ASCII, so splitting
+    there never cuts a UTF-8 character in half).
+
+    Args:
+        raw (bytes): The file content
+
+    Returns:
+        int: Byte offset just past the closing "---", or 0 if the file has no
+             frontmatter
+    """
+    yaml_end = raw.find(b"---", 3) if raw.startswith(b"---") else -1
+    return yaml_end + 3 if yaml_end > 0 else 0
+
+
+def yaml_key_block(lines, key):
+    """
+    Find the lines holding a top-level key and its value in frontmatter.
+
+    The block runs from the "key:" line through every following line that is
+    indented or is a "- " list item, which covers block lists as well as
+    flow values continued over several lines.
+
+    Args:
+        lines (list): Frontmatter lines (with line endings), without delimiters
+        key (str): The top-level key to find
+
+    Returns:
+        tuple: (start, end) line indexes of the block, or None if the key is
+               not written as a plain top-level key
+    """
+    prefix = key + ":"
+    for start, line in enumerate(lines):
+        if line.startswith(prefix) and line[len(prefix) : len(prefix) + 1] in (
+            "",
+            " ",
+            "\t",
+            "\r",
+            "\n",
+        ):
+            end = start + 1
+            while end < len(lines) and (
+                lines[end][:1] in (" ", "\t") or lines[end].startswith("- ")
+            ):
+                end += 1
+            return start, end
+    return None
+
+
+def yaml_list_lines(items, newline, indent="  "):
+    """
+    Serialize items as block list lines with PyYAML.
+
+    Args:
+        items (list): The list entries
+        newline (str): Line ending used by the surrounding frontmatter
+        indent (str): Indentation before each "- " item
+
+    Returns:
+        list: The list's lines, each ending with newline
+    """
+    dumped = yaml.dump(
+        items,
+        Dumper=YamlDumper,
+        allow_unicode=True,
+        width=1000,
+        default_flow_style=False,
+    )
+    return [indent + line + newline for line in dumped.splitlines()]
+
+
+def convert_yaml_tags(yaml_content, tag_map, exact_match=False):
+    """
+    Move tags out of the YAML tags list into related wikilinks.
+
+    The frontmatter is parsed with PyYAML (using the C loader when available),
+    so quoted, flow-style ([a, b]) and comma-separated tags are handled. Tags
+    in YAML are usually written without the # prefix; both forms match. When
+    a tag is converted, only the tags: and related: entries are rewritten in
+    the original text; every other line (comments, quoting, unquoted
+    [[wikilinks]]) is kept byte for byte. In a block list, kept tags keep
+    their original lines, and an unquoted "- #tag" item (which YAML reads as
+    a comment, i.e. null) is matched by the text of its line.
+
+    Args:
+        yaml_content (str): The YAML frontmatter, including delimiters
+        tag_map (dict): Tags (with # prefix) mapped to note names
+        exact_match (bool): Only convert exact tag matches, not nested tags
+
+    Returns:
+        tuple: (modified YAML content, int count of tags converted)
+    """
+    try:
+        meta = yaml.load(yaml_content[3:-3], Loader=YamlLoader)
+    except yaml.YAMLError:
+        return yaml_content, 0
+    if not isinstance(meta, dict):
+        return yaml_content, 0
+
+    tags = meta.get("tags")
+    if isinstance(tags, str):
+        tags = [name for name in YAML_TAG_SEPARATOR_RE.split(tags) if name]
+    elif not isinstance(tags, list):
+        return yaml_content, 0
+
+    newline = "\r\n" if "\r\n" in yaml_content else "\n"
+    lines = yaml_content[3:-3].splitlines(keepends=True)
+    if lines and not lines[-1].endswith("\n"):
+        lines[-1] += newline
+
+    tags_block = yaml_key_block(lines, "tags")
+    if tags_block is None:
+        return yaml_content, 0
+
+    # Line index of each entry when tags are a block list with one line per item
+    item_lines = None
+    if lines[tags_block[0]].rstrip() == "tags:":
+        item_lines = [
+            i
+            for i in range(tags_block[0] + 1, tags_block[1])
+            if lines[i].lstrip().startswith("-")
+        ]
+        if len(item_lines) != len(tags):
+            item_lines = None
+
+    names = {tag.lstrip("#"): wikilink for tag, wikilink in tag_map.items()}
+    kept_tags = []
+    converted_lines = set()
+    wikilinks = []
+    for index, entry in enumerate(tags):
+        if entry is None and item_lines is not None:
+            # "- #tag" parses as an empty item followed by a comment
+            text = lines[item_lines[index]].lstrip()[1:].split()
+            name = text[0].lstrip("#") if text else ""
+        else:
+            name = str(entry).lstrip("#")
+        wikilink = names.get(name)
+        if wikilink is None and not exact_match:
+            # Nested tag: the longest mapped parent wins, as in the body
+            parts = name.split("/")
+            for i in range(len(parts) - 1, 0, -1):
+                wikilink = names.get("/".join(parts[:i]))
+                if wikilink is not None:
+                    break
+        if wikilink is None:
+            kept_tags.append(entry)
+        else:
+            wikilinks.append(f"[[{wikilink}]]")
+            if item_lines is not None:
+                converted_lines.add(item_lines[index])
+
+    if not wikilinks:
+        return yaml_content, 0
+
+    # Replacement lines keyed by the (start, end) block they replace
+    edits = {tags_block: []}
+    if kept_tags and item_lines is not None:
+        # Drop only the converted items; kept items and comments stay as written
+        edits[tags_block] = [
+            lines[i] for i in range(*tags_block) if i not in converted_lines
+        ]
+    elif kept_tags:
+        edits[tags_block] = ["tags:" + newline] + yaml_list_lines(kept_tags, newline)
+
+    related = meta.get("related")
+    if related is None:
+        related = []
+    elif not isinstance(related, list):
+        related = [related]
+    # An unquoted [[Note]] parses as a nested list ([["Note"]])
+    related = [
+        f"[[{entry[0]}]]" if isinstance(entry, list) and len(entry) == 1 else entry
+        for entry in related
+    ]
+    new_links = []
+    for link in wikilinks:
+        if link not in related and link not in new_links:
+            new_links.append(link)
+
+    if new_links:
+        related_block = yaml_key_block(lines, "related")
+        if related_block is None:
+            if "related" in meta:
+                return yaml_content, 0
+            edits[(len(lines), len(lines))] = ["related:" + newline] + yaml_list_lines(
+                new_links, newline
+            )
+        else:
+            start, end = related_block
+            items = [line for line in lines[start + 1 : end] if line.strip()]
+            if (
+                lines[start].rstrip() == "related:"
+                and items
+                and items[0].lstrip().startswith("- ")
+            ):
+                # Block list: add the new items after the existing ones
+                indent = items[0][: len(items[0]) - len(items[0].lstrip())]
+                edits[(end, end)] = yaml_list_lines(new_links, newline, indent)
+            else:
+                edits[related_block] = ["related:" + newline] + yaml_list_lines(
+                    related + new_links, newline
+                )
+
+    for start, end in sorted(edits, reverse=True):
+        lines[start:end] = edits[(start, end)]
+
+    return "---" + "".join(lines) + "---", len(wikilinks)
+
+
+def link_backup(file_path, backup_path):
+    """
+    Create a backup of a file as a hardlink, falling back to a copy.
+
+    A hardlink shares the original's data, so no bytes are written. This is
+    only safe because write_converted_file swaps in a new inode with
+    os.replace instead of writing into the linked one.
+
+    Args:
+        file_path (str): Path to the file to back up
+        backup_path (str): Path of the backup to create
+    """
+    # Replace any backup left over from a previous run
+    if os.path.lexists(backup_path):
+        os.remove(backup_path)
+    try:
+        os.link(file_path, backup_path)
+    except OSError:
+        # Hardlinks unsupported (cross-device, some synced/network filesystems)
+        shutil.copyfile(file_path, backup_path)
+        shutil.copystat(file_path, backup_path)
+
+
+def write_converted_file(file_path, modified_content, backup_name, create_backup):
+    """
+    Write converted content to a file, backing up the original first.
+
+    The content is written to a temporary file that is renamed over the
+    original with os.replace, so the file is never left half-written and a
+    hardlinked backup keeps the original content.
+
+    Args:
+        file_path (str): Path to the markdown file
+        modified_content (bytes): The converted content, UTF-8 encoded
+        backup_name (str): Name inserted into the backup file name
+        create_backup (bool): Whether to create a backup of the original file
+    """
+    # Create backup if requested
+    if create_backup:
+        link_backup(file_path, file_path + f".{backup_name}.backup")
+
+    # Write modified content
+    tmp_path = file_path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as file:
+            file.write(modified_content)
+        shutil.copymode(file_path, tmp_path)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 
 def convert_tag_to_wikilink(
     file_path,
     tag,
     wikilink,
+    tag_pattern,
+    replacement,
     create_backup=True,
     dry_run=False,
     convert_yaml=False,
@@ -60,115 +549,253 @@ def convert_tag_to_wikilink(
         file_path (str): Path to the markdown file
         tag (str): The tag to convert (with # prefix)
         wikilink (str): The note name to use in the wikilink (without [[]])
+        tag_pattern (re.Pattern): Compiled tag pattern from compile_tag_pattern
+        replacement (str): The wikilink text put in place of the tag
         create_backup (bool): Whether to create a backup of the original file
         dry_run (bool): If True, only simulate changes without writing to files
         convert_yaml (bool): Whether to convert tags in YAML frontmatter
         exact_match (bool): Only convert exact tag matches
 
+    Output is collected rather than printed, since this runs in a worker
+    process; the caller prints the returned messages in batches.
+
     Returns:
-        tuple: (bool indicating if file was modified, int count of tags converted)
+        tuple: (bool indicating if file was modified, int count of tags converted,
+                list of messages to print)
     """
+    messages = []
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            content = file.read()
+        # Only files that contain the tag are decoded
+        raw = read_if_contains(file_path, [tag.encode("utf-8")])
+        if raw is None:
+            return False, 0, messages
 
-        # Check if file contains the tag
-        if tag not in content:
-            return False, 0
-
-        # Split content into YAML frontmatter and body
-        yaml_end = None
-        if content.startswith("---"):
-            yaml_end = content.find("---", 3)
-
-        if yaml_end is not None and yaml_end > 0:
-            yaml_content = content[: yaml_end + 3]
-            body_content = content[yaml_end + 3 :]
-        else:
-            yaml_content = ""
-            body_content = content
+        # Split off the YAML frontmatter; it stays undecoded bytes unless its
+        # tags are converted, and only the body is decoded
+        body_start = frontmatter_end(raw)
+        frontmatter = raw[:body_start]
+        body_content = raw[body_start:].decode("utf-8")
 
         # Process body content (always convert in main content)
         if exact_match:
-            # Exact match pattern
-            tag_pattern = r"(?<!\w)" + re.escape(tag) + r"(?!\w)"
+            # A literal tag needs no regex engine, only a boundary check
+            body_content, tag_count = replace_exact_tag(body_content, tag, replacement)
         else:
-            # Also match nested tags that start with this tag
-            tag_pattern = r"(?<!\w)" + re.escape(tag) + r"(?:/[a-zA-Z0-9_.-]+)*(?!\w)"
+            # Replace tags with wikilinks in body, counting them in the same pass
+            body_content, tag_count = tag_pattern.subn(replacement, body_content)
+
+        # Process YAML frontmatter if requested (only a tags: block can change)
+        yaml_count = 0
+        if convert_yaml and b"tags:" in frontmatter:
+            yaml_content, yaml_count = convert_yaml_tags(
+                frontmatter.decode("utf-8"), {tag: wikilink}, exact_match
+            )
+            if yaml_count:
+                frontmatter = yaml_content.encode("utf-8")
 
-        # Count occurrences
-        body_matches = re.findall(tag_pattern, body_content)
-        tag_count = len(body_matches)
+        # Every counted conversion changes the text, so the counts tell whether
+        # the file changed without comparing the whole content
+        if tag_count + yaml_count:
+            if not dry_run:
+                # Combine content back together
+                modified_content = frontmatter + body_content.encode("utf-8")
+                write_converted_file(
+                    file_path,
+                    modified_content,
+                    tag.replace("#", ""),
+                    create_backup,
+                )
 
-        # Replace tags with wikilinks in body
-        body_content = re.sub(tag_pattern, f"[[{wikilink}]]", body_content)
+                messages.append(
+                    f"Converted {tag_count + yaml_count} tags in: {os.path.relpath(file_path, VAULT_PATH)}"
+                )
+
+            return True, tag_count + yaml_count, messages
+        return False, 0, messages
 
-        # Process YAML frontmatter if requested
+    except Exception as e:
+        messages.append(f"Error processing {file_path}: {str(e)}")
+        return False, 0, messages
+
+
+def convert_tag_map_to_wikilinks(
+    file_path,
+    tag_map,
+    tags_pattern,
+    replacements,
+    create_backup=True,
+    dry_run=False,
+    convert_yaml=False,
+    exact_match=False,
+):
+    """
+    Convert every tag in a tag map to its wikilink in a file, in one pass.
+
+    Args:
+        file_path (str): Path to the markdown file
+        tag_map (dict): Tags (with # prefix) mapped to note names
+        tags_pattern (re.Pattern): Compiled pattern from compile_tag_map_pattern
+        replacements (dict): Tags mapped to the wikilink text put in their place
+        create_backup (bool): Whether to create a backup of the original file
+        dry_run (bool): If True, only simulate changes without writing to files
+        convert_yaml (bool): Whether to convert tags in YAML frontmatter
+        exact_match (bool): Only convert exact tag matches
+
+    Output is collected rather than printed, since this runs in a worker
+    process; the caller prints the returned messages in batches.
+
+    Returns:
+        tuple: (bool indicating if file was modified, int count of tags converted,
+                list of messages to print)
+    """
+    messages = []
+    try:
+        # Only files that contain at least one mapped tag are decoded
+        raw = read_if_contains(file_path, [tag.encode("utf-8") for tag in tag_map])
+        if raw is None:
+            return False, 0, messages
+
+        # Split off the YAML frontmatter; it stays undecoded bytes unless its
+        # tags are converted, and only the body is decoded
+        body_start = frontmatter_end(raw)
+        frontmatter = raw[:body_start]
+        body_content = raw[body_start:].decode("utf-8")
+
+        # One scan of the body replaces every mapped tag
+        body_content, tag_count = tags_pattern.subn(
+            lambda match: replacements[match.group(1)], body_content
+        )
+
+        # Process YAML frontmatter if requested, every mapped tag in one parse
+        # (only a tags: block can change)
         yaml_count = 0
-        if convert_yaml and yaml_content:
-            # This is more complex - we need to handle YAML tag arrays
-            yaml_lines = yaml_content.split("\n")
-            modified_yaml_lines = []
-
-            in_tags_block = False
-            for line in yaml_lines:
-                if line.strip().startswith("tags:"):
-                    in_tags_block = True
-                    modified_yaml_lines.append(line)
-                elif in_tags_block and line.strip().startswith("-"):
-                    tag_in_line = line.strip()[1:].strip()
-                    if tag_in_line == tag.strip() or (
-                        not exact_match and tag_in_line.startswith(tag.strip())
-                    ):
-                        # Convert this tag to related YAML entry
-                        related_line = f'related:\n  - "[[{wikilink}]]"'
-                        if "related:" not in yaml_content:
-                            modified_yaml_lines.append(related_line)
-                        else:
-                            # Skip this line as we'll add to existing related
-                            yaml_count += 1
-                            continue
-                    else:
-                        modified_yaml_lines.append(line)
-                else:
-                    in_tags_block = False
-
-                    # If this is the related: line, add our wikilink
-                    if line.strip().startswith("related:") and yaml_count > 0:
-                        modified_yaml_lines.append(line)
-                        modified_yaml_lines.append(f'  - "[[{wikilink}]]"')
-                        yaml_count = 0  # Reset so we don't add multiple times
-                    else:
-                        modified_yaml_lines.append(line)
-
-            yaml_content = "\n".join(modified_yaml_lines)
-
-        # Combine content back together
-        modified_content = yaml_content + body_content
-
-        # Only proceed if content actually changed
-        if content != modified_content:
-            if not dry_run:
-                # Create backup if requested
-                if create_backup:
-                    backup_path = file_path + f".{tag.replace('#', '')}.backup"
-                    with open(backup_path, "w", encoding="utf-8") as backup_file:
-                        backup_file.write(content)
+        if convert_yaml and b"tags:" in frontmatter:
+            yaml_content, yaml_count = convert_yaml_tags(
+                frontmatter.decode("utf-8"), tag_map, exact_match
+            )
+            if yaml_count:
+                frontmatter = yaml_content.encode("utf-8")
 
-                # Write modified content
-                with open(file_path, "w", encoding="utf-8") as file:
-                    file.write(modified_content)
+        # Every counted conversion changes the text, so the counts tell whether
+        # the file changed without comparing the whole content
+        if tag_count + yaml_count:
+            if not dry_run:
+                # Combine content back together
+                modified_content = frontmatter + body_content.encode("utf-8")
+                write_converted_file(
+                    file_path, modified_content, "tag-map", create_backup
+                )
 
-                print(
+                messages.append(
                     f"Converted {tag_count + yaml_count} tags in: {os.path.relpath(file_path, VAULT_PATH)}"
                 )
 
-            return True, tag_count + yaml_count
-        return False, 0
+            return True, tag_count + yaml_count, messages
+        return False, 0, messages
 
     except Exception as e:
-        print(f"Error processing {file_path}: {str(e)}")
-        return False, 0
+        messages.append(f"Error processing {file_path}: {str(e)}")
+        return False, 0, messages
+
+
+def flush_output(lines):
+    """Write buffered output lines to stdout in one call and empty the buffer."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+        lines.clear()
+
+
+# Per-file conversion used by convert_with_path, set once in each worker
+# process by init_worker
+_convert_file = None
+
+
+def init_worker(convert_file):
+    """
+    Pool initializer: store the per-file conversion in the worker process.
+
+    The conversion (with its compiled pattern, replacements and flags) is sent
+    to each worker once at startup instead of with every chunk of tasks.
+    """
+    global _convert_file
+    _convert_file = convert_file
+
+
+def convert_with_path(file_path):
+    """
+    Run the worker's per-file conversion and tag the result with the file path,
+    so results from the worker pool can arrive in any order.
+
+    Returns:
+        tuple: (file path, bool indicating if file was modified, int count of
+                tags converted, list of messages to print)
+    """
+    return (file_path, *_convert_file(file_path))
+
+
+def process_files(convert_file, needles):
+    """
+    Run a per-file conversion over every markdown file in the vault.
+
+    Work is split in two stages. A thread pool first checks every file for the
+    tags with mmap.find (I/O-bound, so threads are enough); only the files that
+    contain one are then converted, spread over a process pool with
+    imap_unordered so progress is reported as results come in. convert_file
+    is handed to each worker once, by init_worker, so it must be picklable (a
+    functools.partial of a module-level function). Progress and per-file
+    messages are buffered and written every OUTPUT_FLUSH_INTERVAL files.
+
+    Args:
+        convert_file (callable): Takes a file path and returns (bool indicating
+            if the file was modified, int count of tags converted, list of
+            messages to print)
+        needles (list): UTF-8 encoded tags; files without any are skipped
+
+    Returns:
+        tuple: (list of modified files, total tags converted, total files processed)
+    """
+    modified_files = []
+    total_tags_converted = 0
+    output = []
+
+    print("Scanning vault for markdown files...")
+    md_files = list(iter_markdown_files(VAULT_PATH, IGNORED_DIRS))
+
+    # Stage 1: find the files that contain a tag, in threads
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=PREFILTER_WORKERS
+    ) as executor:
+        found = executor.map(functools.partial(contains_any, needles=needles), md_files)
+        candidates = [path for path, hit in zip(md_files, found) if hit]
+
+    print(f"Found {len(md_files)} markdown files, {len(candidates)} containing the tag")
+    if not candidates:
+        return modified_files, total_tags_converted, len(md_files)
+
+    # Stage 2: convert only those files, in worker processes
+    with multiprocessing.Pool(
+        min(os.cpu_count() or 1, len(candidates)),
+        initializer=init_worker,
+        initargs=(convert_file,),
+    ) as pool:
+        results = pool.imap_unordered(convert_with_path, candidates, chunksize=16)
+        for i, (file_path, was_modified, tags_converted, messages) in enumerate(
+            results, 1
+        ):
+            # Progress indicator
+            if i % 100 == 1:
+                output.append(f"Processing file {i}/{len(candidates)}...")
+            output.extend(messages)
+            if i % OUTPUT_FLUSH_INTERVAL == 0:
+                flush_output(output)
+
+            if was_modified:
+                modified_files.append((file_path, tags_converted))
+                total_tags_converted += tags_converted
+
+    flush_output(output)
+    return modified_files, total_tags_converted, len(md_files)
 
 
 def process_vault(
@@ -193,30 +820,64 @@ def process_vault(
     Returns:
         tuple: (list of modified files, total tags converted, total files processed)
     """
-    # Find all markdown files
-    md_files = glob.glob(f"{VAULT_PATH}/**/*.md", recursive=True)
-
-    modified_files = []
-    total_tags_converted = 0
+    # Compile the tag pattern and build the replacement once for the whole vault
+    tag_pattern = compile_tag_pattern(tag, exact_match)
+    replacement = f"[[{wikilink}]]"
+
+    return process_files(
+        functools.partial(
+            convert_tag_to_wikilink,
+            tag=tag,
+            wikilink=wikilink,
+            tag_pattern=tag_pattern,
+            replacement=replacement,
+            create_backup=create_backup,
+            dry_run=dry_run,
+            convert_yaml=convert_yaml,
+            exact_match=exact_match,
+        ),
+        [tag.encode("utf-8")],
+    )
 
-    file_count = len(md_files)
-    print(f"Found {file_count} markdown files to process")
 
-    for i, file_path in enumerate(md_files):
-        # Progress indicator
-        if i % 100 == 0:
-            print(
-                f"Processing file {i+1}/{file_count}... ({((i+1)/file_count)*100:.1f}%)"
-            )
+def process_vault_batch(
+    tag_map,
+    create_backup=True,
+    dry_run=False,
+    convert_yaml=False,
+    exact_match=False,
+):
+    """
+    Process all markdown files in the vault to convert every tag in a tag map.
 
-        was_modified, tags_converted = convert_tag_to_wikilink(
-            file_path, tag, wikilink, create_backup, dry_run, convert_yaml, exact_match
-        )
-        if was_modified:
-            modified_files.append((file_path, tags_converted))
-            total_tags_converted += tags_converted
+    Args:
+        tag_map (dict): Tags (with # prefix) mapped to note names
+        create_backup (bool): Whether to create backups of modified files
+        dry_run (bool): If True, only simulate changes without writing to files
+        convert_yaml (bool): Whether to convert tags in YAML frontmatter
+        exact_match (bool): Only convert exact tag matches
 
-    return modified_files, total_tags_converted, file_count
+    Returns:
+        tuple: (list of modified files, total tags converted, total files processed)
+    """
+    # One pattern covering every tag, compiled once for the whole vault, and
+    # the wikilink text for each tag, built once rather than per match
+    tags_pattern = compile_tag_map_pattern(tag_map, exact_match)
+    replacements = {tag: f"[[{wikilink}]]" for tag, wikilink in tag_map.items()}
+
+    return process_files(
+        functools.partial(
+            convert_tag_map_to_wikilinks,
+            tag_map=tag_map,
+            tags_pattern=tags_pattern,
+            replacements=replacements,
+            create_backup=create_backup,
+            dry_run=dry_run,
+            convert_yaml=convert_yaml,
+            exact_match=exact_match,
+        ),
+        [tag.encode("utf-8") for tag in tag_map],
+    )
 
 
 def main():
@@ -224,14 +885,15 @@ def main():
     parser = argparse.ArgumentParser(
         description="Convert tags to wikilinks in an Obsidian vault."
     )
-    parser.add_argument(
-        "--tag", required=True, help="The tag to convert (include the # prefix)"
-    )
+    parser.add_argument("--tag", help="The tag to convert (include the # prefix)")
     parser.add_argument(
         "--wikilink",
-        required=True,
         help="The note name to use in the wikilink (without [[]])",
     )
+    parser.add_argument(
+        "--tag-map",
+        help="JSON file mapping tags to note names, all converted in one pass",
+    )
     parser.add_argument(
         "--dry-run", action="store_true", help="Preview changes without modifying files"
     )
@@ -252,32 +914,65 @@ def main():
 
     create_backup = not args.no_backup
 
-    # Validate the tag
-    if not args.tag.startswith("#"):
-        print("Error: Tag must start with # prefix")
+    if args.tag_map:
+        try:
+            with open(args.tag_map, "r", encoding="utf-8") as file:
+                tag_map = json.load(file)
+        except Exception as e:
+            print(f"Error reading tag map {args.tag_map}: {str(e)}")
+            return
+        if not isinstance(tag_map, dict) or not tag_map:
+            print("Error: Tag map must be a non-empty JSON object")
+            return
+    elif args.tag and args.wikilink:
+        tag_map = {args.tag: args.wikilink}
+    else:
+        parser.error("either --tag and --wikilink, or --tag-map, is required")
+
+    # Validate the tags
+    for tag, wikilink in tag_map.items():
+        if not tag.startswith("#"):
+            print(f"Error: Tag must start with # prefix: {tag}")
+            return
+        if not isinstance(wikilink, str):
+            print(f"Error: Note name for {tag} must be a string")
+            return
+
+    if args.convert_yaml and yaml is None:
+        print("Error: --convert-yaml requires PyYAML (pip install pyyaml)")
         return
 
     print(f"{'[DRY RUN] ' if args.dry_run else ''}Starting tag conversion...")
-    print(f"Converting: {args.tag} → [[{args.wikilink}]]")
+    for tag, wikilink in tag_map.items():
+        print(f"Converting: {tag} → [[{wikilink}]]")
     print(f"Vault path: {VAULT_PATH}")
     print(f"Creating backups: {'No' if args.no_backup else 'Yes'}")
     print(f"Converting in YAML: {'Yes' if args.convert_yaml else 'No'}")
     print(f"Using exact matching: {'Yes' if args.exact_match else 'No'}")
 
-    start_time = datetime.now()
-    modified_files, total_tags_converted, total_files = process_vault(
-        args.tag,
-        args.wikilink,
-        create_backup,
-        args.dry_run,
-        args.convert_yaml,
-        args.exact_match,
-    )
-    end_time = datetime.now()
+    start_ns = time.perf_counter_ns()
+    if args.tag_map:
+        modified_files, total_tags_converted, total_files = process_vault_batch(
+            tag_map,
+            create_backup,
+            args.dry_run,
+            args.convert_yaml,
+            args.exact_match,
+        )
+    else:
+        modified_files, total_tags_converted, total_files = process_vault(
+            args.tag,
+            args.wikilink,
+            create_backup,
+            args.dry_run,
+            args.convert_yaml,
+            args.exact_match,
+        )
+    elapsed_ms = (time.perf_counter_ns() - start_ns) / 1e6
 
     # Generate report
     print("\n" + "=" * 50)
-    print(f"SUMMARY REPORT ({end_time - start_time})")
+    print(f"SUMMARY REPORT ({elapsed_ms:.1f} ms)")
     print("=" * 50)
 
     print(f"\nTotal files processed: {total_files}")
@@ -293,8 +988,9 @@ def main():
     if args.dry_run:
         print("\n[DRY RUN] No files were actually modified.")
     else:
+        target = "wikilinks" if args.tag_map else f"[[{args.wikilink}]]"
         print(
-            f"\nACTION COMPLETE: Converted {total_tags_converted} tags to [[{args.wikilink}]] in {len(modified_files)} files."
+            f"\nACTION COMPLETE: Converted {total_tags_converted} tags to {target} in {len(modified_files)} files."
         )
 
     print("\nCompleted!")
@@ -8,8 +8,8 @@ collects all markdown files (*.md), and reports any duplicate filenames along wi
 their full paths.
 
 Technical Implementation:
-- Uses os.walk() to recursively traverse all directories in the vault
-- Maintains a dictionary to track filenames and their paths
+- Uses a recursive os.scandir() walk to traverse all directories in the vault
+- Maintains a defaultdict mapping each filename to the directories it appears in
 - Ignores specified directories (like .git, .trash, etc.)
 - Outputs results to console, showing duplicate filenames and their locations
 - Can be customized to ignore specific directories via the IGNORED_DIRS list
@@ -17,10 +17,43 @@ Technical Implementation:
 
 import os
 import sys
-from typing import Dict, List, Set
+from collections import defaultdict
+from typing import Dict, Iterator, List, Set, Tuple
 from pathlib import Path
 
 
+def iter_markdown_files(
+    directory: str, ignored_dirs: Set[str]
+) -> Iterator[Tuple[str, str]]:
+    """
+    Recursively yield every markdown file below a directory.
+
+    Uses os.scandir directly, so file and directory checks come from the
+    cached directory entries and ignored directories are pruned by name
+    without building per-directory lists.
+
+    Args:
+        directory (str): Directory to scan
+        ignored_dirs (Set[str]): Set of directory names to ignore
+
+    Yields:
+        Tuple[str, str]: (filename, directory containing the file)
+    """
+    try:
+        entries = os.scandir(directory)
+    except OSError as e:
+        # Unreadable directories are skipped, as os.walk did
+        print(f"Warning: Could not read directory {directory}: {e}", file=sys.stderr)
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in ignored_dirs:
+                    yield from iter_markdown_files(entry.path, ignored_dirs)
+            elif entry.name.endswith(".md") and entry.is_file():
+                yield entry.name, directory
+
+
 def find_duplicate_notes(
     vault_path: str, ignored_dirs: Set[str]
 ) -> Dict[str, List[str]]:
@@ -34,28 +67,20 @@ def find_duplicate_notes(
     Returns:
         Dict[str, List[str]]: Dictionary mapping duplicate filenames to lists of their paths
     """
-    # Dictionary to track filenames and their paths
-    file_paths: Dict[str, List[str]] = {}
+    # Track the directories each filename appears in; full paths are only
+    # built for the (few) names that turn out to be duplicates
+    file_dirs: Dict[str, List[str]] = defaultdict(list)
 
     # Walk through the vault directory structure
-    for root, dirs, files in os.walk(vault_path):
-        # Skip ignored directories
-        dirs[:] = [d for d in dirs if d not in ignored_dirs]
-
-        # Process only markdown files
-        md_files = [f for f in files if f.endswith(".md")]
-
-        for filename in md_files:
-            full_path = os.path.join(root, filename)
-
-            # Track the file
-            if filename not in file_paths:
-                file_paths[filename] = []
-            file_paths[filename].append(full_path)
+    for filename, root in iter_markdown_files(vault_path, ignored_dirs):
+        # Track the file
+        file_dirs[filename].append(root)
 
     # Filter to keep only duplicates
     duplicates = {
-        filename: paths for filename, paths in file_paths.items() if len(paths) > 1
+        filename: [os.path.join(root, filename) for root in roots]
+        for filename, roots in file_dirs.items()
+        if len(roots) > 1
     }
 
     return duplicates
@@ -8,9 +8,9 @@
 # **Functionality:**
 # 1. Recursively walks through the specified root directory.
 # 2. Identifies all files with the '.md' extension.
-# 3. For each Markdown file, it reads the first few lines to check for the presence of YAML front matter.
+# 3. For each Markdown file, it reads the first 4 KB (as bytes) to check for the presence of YAML front matter.
 #    - A file is considered to have YAML front matter if it starts with a line exactly equal to '---'
-#      and contains another line exactly equal to '---' within the first ~15 lines (to avoid reading huge files unnecessarily if YAML is missing).
+#      and contains another line exactly equal to '---' within the first ~45 lines of that block (to avoid reading huge files unnecessarily if YAML is missing).
 # 4. Compiles a list of files that *do not* contain YAML front matter.
 # 5. Counts the total number of Markdown files found.
 # 6. Counts the number of files with and without YAML front matter.
@@ -25,7 +25,7 @@
 #
 # **Technical Implementation:**
 # - Uses the `os` module, specifically `os.walk`, to traverse the directory structure.
-# - Uses standard file I/O operations to read the beginning of each Markdown file.
+# - Reads the beginning of each Markdown file with a single binary read, without decoding it.
 # - Implements simple string checking ('---') to detect YAML boundaries.
 # - Calculates percentages and formats the output for readability.
 # - The root directory to scan is hardcoded but can be easily modified.
@@ -33,6 +33,9 @@
 import os
 import sys
 
+# Number of bytes read from the start of each file when looking for front matter
+HEAD_SIZE = 4096
+
 
 def has_yaml_front_matter(filepath: str) -> bool:
     """
@@ -45,17 +48,16 @@ def has_yaml_front_matter(filepath: str) -> bool:
         bool: True if YAML front matter is detected, False otherwise.
     """
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            first_line = f.readline().strip()
-            if first_line != "---":
-                return False
-            # Look for the closing '---' within the next ~15 lines
-            for i, line in enumerate(f):
-                if line.strip() == "---":
-                    return True
-                if i > 45:  # Stop checking after a reasonable number of lines
-                    break
+        # Front matter sits at the top of the file, so one small binary read is
+        # enough (and nothing needs to be decoded)
+        with open(filepath, "rb") as f:
+            head = f.read(HEAD_SIZE)
+
+        first_line, _, rest = head.partition(b"\n")
+        if first_line.strip() != b"---":
             return False
+        # Look for the closing '---' within the next ~45 lines
+        return any(line.strip() == b"---" for line in rest.split(b"\n", 47)[:47])
     except Exception as e:
         print(f"Error reading file {filepath}: {e}", file=sys.stderr)
         return False  # Treat errors as missing YAML for safety
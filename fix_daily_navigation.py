@@ -13,6 +13,8 @@ The script specifically targets the broken navigation row in daily notes without
 - Focuses only on files in the daily notes directory
 - Uses regex to identify and fix the specific broken navigation pattern
 - Creates backups of modified files
+- Processes files in a pool of worker processes (one per CPU core)
+- Buffers progress output and writes it in batches
 - Generates a summary report of changes made
 
 ## Usage
@@ -26,15 +28,20 @@ Optional flags:
 ## Dependencies
 - os: For file operations and path handling
 - re: For regular expression pattern matching
+- sys: For writing buffered progress output
 - glob: For finding files recursively
 - argparse: For command-line argument parsing
+- functools, multiprocessing: For fixing files in parallel worker processes
 """
 
 import os
 import re
+import sys
 import glob
 import argparse
-from datetime import datetime
+import functools
+import multiprocessing
+import time
 
 # Define the root directory of your Obsidian vault
 VAULT_PATH = "/Users/danildanilov/Obsidian"
@@ -43,9 +50,15 @@ VAULT_PATH = "/Users/danildanilov/Obsidian"
 DAILY_NOTES_DIR = "01 - Calendar/Daily"
 WEEKLY_NOTES_DIR = "01 - Calendar/Weekly"
 
+# Progress and per-file messages are buffered and written once every this many files
+OUTPUT_FLUSH_INTERVAL = 500
+
 # Updated regex pattern to find broken navigation links in daily notes
 # This pattern matches the broken format with missing closing brackets
-BROKEN_NAV_PATTERN = r"←←\s*\[\[([^\]/|]+)(?:\s*\|([^\]/]+))?\s*\/\s*\[\[([^\]/|]+)(?:\s*\|([^\]/]+))?\s*\/\s*\[\[([^\]/|]+)(?:\s*\|([^\]/]+))?\s*\/\s*\[\[([^\]/|]+)(?:\s*\|([^\]/]+))?\s*→→"
+# (compiled once at import time rather than looked up for every file)
+BROKEN_NAV_PATTERN = re.compile(
+    r"←←\s*\[\[([^\]/|]+)(?:\s*\|([^\]/]+))?\s*\/\s*\[\[([^\]/|]+)(?:\s*\|([^\]/]+))?\s*\/\s*\[\[([^\]/|]+)(?:\s*\|([^\]/]+))?\s*\/\s*\[\[([^\]/|]+)(?:\s*\|([^\]/]+))?\s*→→"
+)
 
 
 def fix_navigation_links(file_path, create_backup=True, dry_run=False):
@@ -57,20 +70,29 @@ def fix_navigation_links(file_path, create_backup=True, dry_run=False):
         create_backup (bool): Whether to create a backup of the original file
         dry_run (bool): If True, only simulate changes without writing to files
 
+    Output is collected rather than printed, since this runs in a worker
+    process; the caller prints the returned messages in batches.
+
     Returns:
-        tuple: (bool indicating if file was modified, number of fixes made)
+        tuple: (bool indicating if file was modified, number of fixes made,
+                list of messages to print)
     """
+    messages = []
     try:
         with open(file_path, "r", encoding="utf-8") as file:
             content = file.read()
 
+        # The navigation row always contains both arrow markers; checking for
+        # them first skips the regex for every other file
+        if "←←" not in content or "→→" not in content:
+            return False, 0, messages
+
         # Check if this file contains the broken navigation pattern
-        nav_match = re.search(BROKEN_NAV_PATTERN, content)
+        nav_match = BROKEN_NAV_PATTERN.search(content)
         if not nav_match:
-            return False, 0
+            return False, 0, messages
 
         # Extract all parts
-        nav_row = nav_match.group(0)
         week1 = nav_match.group(1).strip()  # First weekly note
         week1_alias = nav_match.group(2)  # Alias for first weekly note
         day1 = nav_match.group(3).strip()  # Previous day
@@ -103,8 +125,10 @@ def fix_navigation_links(file_path, create_backup=True, dry_run=False):
             + "]] →→"
         )
 
-        # Apply the fix
-        modified_content = content.replace(nav_row, fixed_nav_row)
+        # Apply the fix by splicing at the match span (no second scan for the row)
+        modified_content = (
+            content[: nav_match.start()] + fixed_nav_row + content[nav_match.end() :]
+        )
 
         # Check if content was modified
         if content != modified_content:
@@ -119,14 +143,36 @@ def fix_navigation_links(file_path, create_backup=True, dry_run=False):
                 with open(file_path, "w", encoding="utf-8") as file:
                     file.write(modified_content)
 
-                print(f"Fixed navigation in: {os.path.relpath(file_path, VAULT_PATH)}")
+                messages.append(
+                    f"Fixed navigation in: {os.path.relpath(file_path, VAULT_PATH)}"
+                )
 
-            return True, 1
-        return False, 0
+            return True, 1, messages
+        return False, 0, messages
 
     except Exception as e:
-        print(f"Error processing {file_path}: {str(e)}")
-        return False, 0
+        messages.append(f"Error processing {file_path}: {str(e)}")
+        return False, 0, messages
+
+
+def fix_with_path(file_path, create_backup=True, dry_run=False):
+    """
+    Run fix_navigation_links and tag the result with the file path, so results
+    from the worker pool can arrive in any order.
+
+    Returns:
+        tuple: (file path, bool indicating if file was modified, number of fixes
+                made, list of messages to print)
+    """
+    return (file_path, *fix_navigation_links(file_path, create_backup, dry_run))
+
+
+def flush_output(lines):
+    """Write buffered output lines to stdout in one call and empty the buffer."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+        lines.clear()
 
 
 def process_daily_notes(create_backup=True, dry_run=False):
@@ -146,22 +192,34 @@ def process_daily_notes(create_backup=True, dry_run=False):
 
     modified_files = []
     total_fixes = 0
+    output = []
 
     file_count = len(daily_files)
     print(f"Found {file_count} daily note files to process")
 
-    for i, file_path in enumerate(daily_files):
-        # Progress indicator
-        if i % 20 == 0 or i == file_count - 1:
-            print(
-                f"Processing file {i+1}/{file_count}... ({((i+1)/file_count)*100:.1f}%)"
-            )
-
-        was_modified, fixes = fix_navigation_links(file_path, create_backup, dry_run)
-        if was_modified:
-            modified_files.append(file_path)
-            total_fixes += fixes
-
+    with multiprocessing.Pool(os.cpu_count()) as pool:
+        results = pool.imap_unordered(
+            functools.partial(
+                fix_with_path, create_backup=create_backup, dry_run=dry_run
+            ),
+            daily_files,
+            chunksize=16,
+        )
+        for i, (file_path, was_modified, fixes, messages) in enumerate(results):
+            # Progress indicator (buffered, written every OUTPUT_FLUSH_INTERVAL files)
+            if i % 20 == 0 or i == file_count - 1:
+                output.append(
+                    f"Processing file {i+1}/{file_count}... ({((i+1)/file_count)*100:.1f}%)"
+                )
+            output.extend(messages)
+            if (i + 1) % OUTPUT_FLUSH_INTERVAL == 0:
+                flush_output(output)
+
+            if was_modified:
+                modified_files.append(file_path)
+                total_fixes += fixes
+
+    flush_output(output)
     return modified_files, total_fixes, file_count
 
 
@@ -187,15 +245,15 @@ def main():
     print(f"Daily notes directory: {DAILY_NOTES_DIR}")
     print(f"Creating backups: {'No' if args.no_backup else 'Yes'}")
 
-    start_time = datetime.now()
+    start_ns = time.perf_counter_ns()
     modified_files, total_fixes, total_files = process_daily_notes(
         create_backup, args.dry_run
     )
-    end_time = datetime.now()
+    elapsed_ms = (time.perf_counter_ns() - start_ns) / 1e6
 
     # Generate report
     print("\n" + "=" * 50)
-    print(f"SUMMARY REPORT ({end_time - start_time})")
+    print(f"SUMMARY REPORT ({elapsed_ms:.1f} ms)")
     print("=" * 50)
 
     print(f"\nTotal files processed: {total_files}")
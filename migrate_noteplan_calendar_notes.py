@@ -11,16 +11,23 @@
 # Technical Implementation:
 # - Processes calendar notes with various formats (e.g. 20220325.md → 2022-03-25.md)
 # - Migrates notes to appropriate folders based on their type (daily, weekly, monthly, etc.)
-# - Merges content when files with the same date already exist in destination
+# - Merges content when files with the same date already exist in destination, appending
+#   to the existing note without reading or rewriting it
 # - Processes attachment folders (e.g. 20210708_attachments) and categorizes files by type
-# - Copies files to maintain originals in the backup location
-# - Tracks all modified files for potential recovery if needed
+# - Copies files to maintain originals in the backup location; on the same filesystem
+#   the copies are hardlinks (no data is copied), and a hardlinked note gets its own
+#   copy before content is merged into it, so the backup is never changed by the script.
+#   Note that editing a hardlinked file in place elsewhere also changes the backup;
+#   use --preserve-separate-inode to always make independent copies
+# - Tracks all modified files for potential recovery if needed, appending each one to a
+#   JSON Lines log (migration_modified_files_<timestamp>.jsonl) as soon as it is written
 # - Provides a dry-run option and detailed logging
 #
 # Usage:
 # - Basic: python migrate_noteplan_calendar_notes.py
 # - Dry run: python migrate_noteplan_calendar_notes.py --dry-run
 # - Skip attachments: python migrate_noteplan_calendar_notes.py --skip-attachments
+# - Independent copies: python migrate_noteplan_calendar_notes.py --preserve-separate-inode
 #
 # Author: Created with assistance from Claude
 # Date: Created in 2024
@@ -28,8 +35,10 @@
 
 import os
 import re
+import errno
 import shutil
 import logging
+import functools
 from datetime import datetime
 import argparse
 import mimetypes
@@ -43,14 +52,17 @@ logging.basicConfig(
     handlers=[logging.FileHandler("migration_log.txt"), logging.StreamHandler()],
 )
 
-# File pattern matchers
-PATTERNS = {
-    "daily": r"^(\d{8})\.md$",  # 20220325.md
-    "monthly": r"^(\d{4})[-.](\d{2})\.md$",  # 2023-01.md or 2023.01.md
-    "weekly": r"^(\d{4})[-.]?W(\d{1,2})\.md$",  # 2023-W27.md or 2023W27.md
-    "quarterly": r"^(\d{4})[-.]?Q([1-4])\.md$",  # 2023-Q1.md or 2023Q1.md
-    "yearly": r"^(\d{4})\.md$",  # 2024.md
-}
+# File pattern matcher: every calendar note format in one compiled pattern. The
+# outer named group that matched is the note type (match.lastgroup)
+CALENDAR_NOTE_RE = re.compile(
+    r"^(?:"
+    r"(?P<daily>(?P<d_year>\d{4})(?P<d_month>\d{2})(?P<d_day>\d{2}))"  # 20220325.md
+    r"|(?P<monthly>(?P<m_year>\d{4})[-.](?P<m_month>\d{2}))"  # 2023-01.md or 2023.01.md
+    r"|(?P<weekly>(?P<w_year>\d{4})[-.]?W(?P<w_week>\d{1,2}))"  # 2023-W27.md or 2023W27.md
+    r"|(?P<quarterly>(?P<q_year>\d{4})[-.]?Q(?P<q_quarter>[1-4]))"  # 2023-Q1.md or 2023Q1.md
+    r"|(?P<yearly>\d{4})"  # 2024.md
+    r")\.md$"
+)
 
 # Define destination paths
 DEST_PATHS = {
@@ -101,8 +113,32 @@ FILE_TYPES = {
     "video": [".mp4", ".mov", ".avi", ".mkv", ".wmv", ".flv", ".webm", ".m4v"],
 }
 
-# Track modified files for potential recovery
-MODIFIED_FILES = {"created": [], "modified": [], "attachments_moved": []}
+# Extension -> attachment type, built once from FILE_TYPES
+EXT_TO_TYPE = {
+    extension: file_type
+    for file_type, extensions in FILE_TYPES.items()
+    for extension in extensions
+}
+
+# Block size used when appending a NotePlan note to an existing Obsidian note
+MERGE_BUFFER_SIZE = 64 * 1024
+
+# os.link errors meaning hardlinks are not possible here, so a regular copy is made
+# instead (different filesystem, or a filesystem without hardlink support)
+LINK_UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EPERM, errno.ENOTSUP, errno.EMLINK}
+
+# Casefolded names already present in each destination directory, filled in
+# by get_directory_listing and kept up to date as files are placed there
+DEST_DIR_LISTINGS = {}
+
+# Destination directories already known to exist (or, in a dry run, already
+# reported), so each one is checked only once per run
+ENSURED_DIRECTORIES = set()
+
+# Track modified files for potential recovery: each one is appended to the JSON Lines
+# log opened by open_modified_files_log as it happens, and counted for the summary
+MODIFIED_FILES_LOG = None
+MODIFIED_COUNTS = {"created": 0, "modified": 0, "attachments_moved": 0}
 
 
 def setup_argument_parser():
@@ -119,27 +155,41 @@ def setup_argument_parser():
         action="store_true",
         help="Skip processing of attachment folders",
     )
+    parser.add_argument(
+        "--preserve-separate-inode",
+        action="store_true",
+        help="Always copy file data instead of hardlinking to the backup files",
+    )
     return parser
 
 
 def identify_file_type(filename):
     """Identify the type of note file based on filename pattern."""
-    for file_type, pattern in PATTERNS.items():
-        if re.match(pattern, filename):
-            return file_type
-    return None
+    match = CALENDAR_NOTE_RE.match(filename)
+    return match.lastgroup if match else None
 
 
 def get_attachment_type(file_path):
     """Determine the attachment type based on file extension."""
     extension = os.path.splitext(file_path)[1].lower()
 
-    for file_type, extensions in FILE_TYPES.items():
-        if extension in extensions:
-            return file_type
+    file_type = EXT_TO_TYPE.get(extension)
+    if file_type:
+        return file_type
 
     # If extension not in predefined list, use mimetypes
-    mime_type, _ = mimetypes.guess_type(file_path)
+    return guess_attachment_type(extension)
+
+
+@functools.lru_cache(maxsize=None)
+def guess_attachment_type(extension):
+    """
+    Determine the attachment type of an unlisted extension from its MIME type.
+
+    mimetypes reads the system MIME type files on its first guess_type call,
+    so runs where every extension is in FILE_TYPES never load them.
+    """
+    mime_type, _ = mimetypes.guess_type("attachment" + extension)
     if mime_type:
         if mime_type.startswith("audio/"):
             return "audio"
@@ -156,61 +206,90 @@ def get_attachment_type(file_path):
 
 def convert_filename(old_filename, file_type):
     """Convert filename to the appropriate format based on the file type."""
+    # One match of the combined pattern provides every part of the name
+    match = CALENDAR_NOTE_RE.match(old_filename)
+    if not match or match.lastgroup != file_type:
+        # If no conversion needed or possible, return original
+        return old_filename
+
     if file_type == "daily":
         # Convert 20220325.md to 2022-03-25.md
-        date_part = old_filename[:8]
-        return f"{date_part[:4]}-{date_part[4:6]}-{date_part[6:8]}.md"
+        return f"{match['d_year']}-{match['d_month']}-{match['d_day']}.md"
 
     elif file_type == "monthly":
         # Normalize to YYYY-MM.md
-        match = re.match(PATTERNS["monthly"], old_filename)
-        if match:
-            year, month = match.groups()
-            return f"{year}-{month}.md"
+        return f"{match['m_year']}-{match['m_month']}.md"
 
     elif file_type == "weekly":
         # Normalize to YYYY-W##.md
-        match = re.match(PATTERNS["weekly"], old_filename)
-        if match:
-            year, week = match.groups()
-            return f"{year}-W{week.zfill(2)}.md"
+        return f"{match['w_year']}-W{match['w_week'].zfill(2)}.md"
 
     elif file_type == "quarterly":
         # Normalize to YYYY-Q#.md
-        match = re.match(PATTERNS["quarterly"], old_filename)
-        if match:
-            year, quarter = match.groups()
-            return f"{year}-Q{quarter}.md"
-
-    elif file_type == "yearly":
-        # Keep as YYYY.md
-        return old_filename
+        return f"{match['q_year']}-Q{match['q_quarter']}.md"
 
-    # If no conversion needed or possible, return original
+    # Yearly notes keep their YYYY.md name
     return old_filename
 
 
+def copy_file(source_path, dest_path, use_hardlinks=True):
+    """
+    Copy a file from the backup into the vault.
+
+    On the same filesystem the copy is a hardlink: a new directory entry for
+    the same data, so nothing is read or written. Otherwise (or when
+    use_hardlinks is False) the data is copied with shutil.copy2.
+    """
+    if use_hardlinks:
+        try:
+            os.link(source_path, dest_path)
+            return
+        except OSError as e:
+            if e.errno not in LINK_UNSUPPORTED_ERRNOS:
+                raise
+    shutil.copy2(source_path, dest_path)
+
+
+def stream_copy(source_path, dest_file):
+    """
+    Write a file's content to an open binary file in MERGE_BUFFER_SIZE blocks.
+
+    Every block is read with readinto into the same buffer, so no new bytes
+    object is allocated per block.
+    """
+    buffer = bytearray(MERGE_BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open(source_path, "rb", buffering=0) as source_file:
+        while True:
+            size = source_file.readinto(buffer)
+            if not size:
+                break
+            dest_file.write(view[:size])
+
+
 def merge_file_contents(source_path, dest_path):
     """Merge contents of source file into destination file with a clear separator."""
     try:
-        # Read source content
-        with open(source_path, "r", encoding="utf-8") as source_file:
-            source_content = source_file.read()
-
-        # Read destination content
-        with open(dest_path, "r", encoding="utf-8") as dest_file:
-            dest_content = dest_file.read()
+        # A note hardlinked by copy_file shares its data with the backup; give
+        # it its own copy first so appending does not change the backup
+        if os.stat(dest_path).st_nlink > 1:
+            tmp_path = dest_path + ".tmp"
+            shutil.copy2(dest_path, tmp_path)
+            os.replace(tmp_path, dest_path)
 
         # Create a separator with filename and date
         source_filename = os.path.basename(source_path)
         separator = f"\n\n---\n\n**Content imported from NotePlan ({source_filename}) on {datetime.now().strftime('%Y-%m-%d')}:**\n\n"
 
-        # Write merged content
-        with open(dest_path, "w", encoding="utf-8") as merged_file:
-            merged_file.write(dest_content + separator + source_content)
+        # Append the separator and the source content to the destination,
+        # streaming the source in 64 KB blocks instead of reading both files
+        # and rewriting the destination
+        with open(dest_path, "ab") as merged_file:
+            merged_file.write(separator.encode("utf-8"))
+            stream_copy(source_path, merged_file)
 
         # Track the modified file
-        MODIFIED_FILES["modified"].append(dest_path)
+        record_modified_file("modified", dest_path)
 
         return True
     except Exception as e:
@@ -218,8 +297,30 @@ def merge_file_contents(source_path, dest_path):
         return False
 
 
+def get_directory_listing(directory_path):
+    """
+    Return the names in a destination directory, listed once per run.
+
+    Names are casefolded so conflicts are also detected on case-insensitive
+    filesystems (the macOS default). The set is cached in DEST_DIR_LISTINGS and
+    callers add the names of files they place there, so later conflict checks
+    need no filesystem calls.
+    """
+    listing = DEST_DIR_LISTINGS.get(directory_path)
+    if listing is None:
+        try:
+            with os.scandir(directory_path) as entries:
+                listing = {entry.name.casefold() for entry in entries}
+        except FileNotFoundError:
+            listing = set()
+        DEST_DIR_LISTINGS[directory_path] = listing
+    return listing
+
+
 def ensure_directory_exists(directory_path, dry_run=False):
     """Ensure the directory exists, create if it doesn't."""
+    if directory_path in ENSURED_DIRECTORIES:
+        return True
     if not os.path.exists(directory_path):
         if dry_run:
             logging.info(f"Would create directory: {directory_path}")
@@ -230,10 +331,11 @@ def ensure_directory_exists(directory_path, dry_run=False):
             except Exception as e:
                 logging.error(f"Failed to create directory {directory_path}: {str(e)}")
                 return False
+    ENSURED_DIRECTORIES.add(directory_path)
     return True
 
 
-def process_note_file(source_path, file_type, dry_run=False):
+def process_note_file(source_path, file_type, dry_run=False, use_hardlinks=True):
     """Process a single note file based on its type."""
     filename = os.path.basename(source_path)
     new_filename = convert_filename(filename, file_type)
@@ -245,8 +347,11 @@ def process_note_file(source_path, file_type, dry_run=False):
         return False
 
     try:
-        # Handle existing files
-        if os.path.exists(dest_path):
+        # Handle existing files: presence comes from the cached destination
+        # listing, which is updated below as notes are copied in, so several
+        # source variants of one date all merge into the same note
+        existing_names = get_directory_listing(dest_dir)
+        if new_filename.casefold() in existing_names:
             if dry_run:
                 logging.info(f"Would merge contents: {source_path} → {dest_path}")
             else:
@@ -259,17 +364,18 @@ def process_note_file(source_path, file_type, dry_run=False):
             if dry_run:
                 logging.info(f"Would copy file: {source_path} → {dest_path}")
             else:
-                shutil.copy2(source_path, dest_path)
+                copy_file(source_path, dest_path, use_hardlinks)
+                existing_names.add(new_filename.casefold())
                 logging.info(f"Copied file: {source_path} → {dest_path}")
                 # Track the created file
-                MODIFIED_FILES["created"].append(dest_path)
+                record_modified_file("created", dest_path)
                 return True
     except Exception as e:
         logging.error(f"Error processing {filename}: {str(e)}")
         return False
 
 
-def process_attachment_file(file_path, dry_run=False):
+def process_attachment_file(file_path, dry_run=False, use_hardlinks=True):
     """Process a single attachment file, moving it to the appropriate folder."""
     attachment_type = get_attachment_type(file_path)
     dest_dir = ATTACHMENT_PATHS[attachment_type]
@@ -280,10 +386,11 @@ def process_attachment_file(file_path, dry_run=False):
     if not ensure_directory_exists(dest_dir, dry_run):
         return False
 
-    # Handle filename conflict
+    # Handle filename conflict (checked against the cached directory listing)
+    existing_names = get_directory_listing(dest_dir)
     counter = 1
     original_filename = filename
-    while os.path.exists(dest_path) and not dry_run:
+    while filename.casefold() in existing_names and not dry_run:
         name, ext = os.path.splitext(original_filename)
         filename = f"{name}_{counter}{ext}"
         dest_path = os.path.join(dest_dir, filename)
@@ -293,17 +400,18 @@ def process_attachment_file(file_path, dry_run=False):
         if dry_run:
             logging.info(f"Would move attachment: {file_path} → {dest_path}")
         else:
-            shutil.copy2(file_path, dest_path)
+            copy_file(file_path, dest_path, use_hardlinks)
+            existing_names.add(filename.casefold())
             logging.info(f"Moved attachment: {file_path} → {dest_path}")
             # Track the moved attachment
-            MODIFIED_FILES["attachments_moved"].append(dest_path)
+            record_modified_file("attachments_moved", dest_path)
         return True
     except Exception as e:
         logging.error(f"Error processing attachment {file_path}: {str(e)}")
         return False
 
 
-def process_attachment_folder(folder_path, dry_run=False):
+def process_attachment_folder(folder_path, dry_run=False, use_hardlinks=True):
     """Process an attachment folder and all its contents."""
     processed = 0
     errors = 0
@@ -315,7 +423,7 @@ def process_attachment_folder(folder_path, dry_run=False):
     for root, _, files in os.walk(folder_path):
         for file in files:
             file_path = os.path.join(root, file)
-            if process_attachment_file(file_path, dry_run):
+            if process_attachment_file(file_path, dry_run, use_hardlinks):
                 processed += 1
             else:
                 errors += 1
@@ -323,23 +431,38 @@ def process_attachment_folder(folder_path, dry_run=False):
     return processed, errors
 
 
-def save_modified_files_list(dry_run=False):
-    """Save the list of modified files to a JSON file for recovery purposes."""
+def open_modified_files_log(dry_run=False):
+    """Open the JSON Lines log that records modified files for recovery purposes."""
+    global MODIFIED_FILES_LOG
     if dry_run:
         return
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"migration_modified_files_{timestamp}.json"
+    filename = f"migration_modified_files_{timestamp}.jsonl"
 
     try:
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(MODIFIED_FILES, f, indent=2)
-        logging.info(f"Saved list of modified files to {filename}")
+        MODIFIED_FILES_LOG = open(filename, "a", encoding="utf-8")
+        logging.info(f"Recording modified files in {filename}")
     except Exception as e:
-        logging.error(f"Error saving modified files list: {str(e)}")
+        logging.error(f"Error opening modified files log: {str(e)}")
+
+
+def record_modified_file(operation, path):
+    """
+    Count a modified file and append it to the recovery log.
 
+    Each entry is flushed straight away, so the log stays complete even if
+    the migration is interrupted.
+    """
+    MODIFIED_COUNTS[operation] += 1
+    if MODIFIED_FILES_LOG is not None:
+        MODIFIED_FILES_LOG.write(json.dumps({"op": operation, "path": path}) + "\n")
+        MODIFIED_FILES_LOG.flush()
 
-def migrate_files(source_dir, dry_run=False, skip_attachments=False):
+
+def migrate_files(
+    source_dir, dry_run=False, skip_attachments=False, use_hardlinks=True
+):
     """Migrate all files from source directory."""
     if not os.path.exists(source_dir):
         logging.error(f"Source directory does not exist: {source_dir}")
@@ -356,23 +479,34 @@ def migrate_files(source_dir, dry_run=False, skip_attachments=False):
         "skipped": 0,
     }
 
-    # First, process all the note files
-    for item in os.listdir(source_dir):
-        item_path = os.path.join(source_dir, item)
+    # Record modified files for recovery as they are written
+    open_modified_files_log(dry_run)
+
+    # First, process all the note files (os.scandir entries carry their type,
+    # so no extra stat call is needed per item)
+    with os.scandir(source_dir) as entries:
+        items = list(entries)
 
-        # Handle attachment folders
-        if os.path.isdir(item_path) and "_attachments" in item:
+    for entry in items:
+        item = entry.name
+        item_path = entry.path
+        is_dir = entry.is_dir(follow_symlinks=False)
+
+        # Handle attachment folders (NotePlan names them <date>_attachments)
+        if is_dir and item.endswith("_attachments"):
             if skip_attachments:
                 logging.info(f"Skipping attachment folder: {item_path}")
             else:
                 logging.info(f"Processing attachment folder: {item_path}")
-                processed, errors = process_attachment_folder(item_path, dry_run)
+                processed, errors = process_attachment_folder(
+                    item_path, dry_run, use_hardlinks
+                )
                 stats["attachments"]["processed"] += processed
                 stats["attachments"]["errors"] += errors
             continue
 
         # Skip directories that are not attachment folders
-        if os.path.isdir(item_path):
+        if is_dir:
             logging.debug(f"Skipping non-attachment directory: {item_path}")
             continue
 
@@ -380,7 +514,7 @@ def migrate_files(source_dir, dry_run=False, skip_attachments=False):
         if item.endswith(".md"):
             file_type = identify_file_type(item)
             if file_type:
-                if process_note_file(item_path, file_type, dry_run):
+                if process_note_file(item_path, file_type, dry_run, use_hardlinks):
                     stats[file_type]["processed"] += 1
                 else:
                     stats[file_type]["errors"] += 1
@@ -391,8 +525,9 @@ def migrate_files(source_dir, dry_run=False, skip_attachments=False):
             logging.debug(f"Skipping non-markdown file: {item}")
             stats["skipped"] += 1
 
-    # Save the list of modified files for recovery
-    save_modified_files_list(dry_run)
+    # Close the list of modified files
+    if MODIFIED_FILES_LOG is not None:
+        MODIFIED_FILES_LOG.close()
 
     # Print summary
     logging.info("\nMigration Summary:")
@@ -418,19 +553,13 @@ def migrate_files(source_dir, dry_run=False, skip_attachments=False):
 
     # Print recovery information
     if not dry_run:
-        total_modified = (
-            len(MODIFIED_FILES["created"])
-            + len(MODIFIED_FILES["modified"])
-            + len(MODIFIED_FILES["attachments_moved"])
-        )
+        total_modified = sum(MODIFIED_COUNTS.values())
         logging.info(f"\nTotal files modified: {total_modified}")
-        logging.info(f"  - Files created: {len(MODIFIED_FILES['created'])}")
-        logging.info(f"  - Files modified: {len(MODIFIED_FILES['modified'])}")
+        logging.info(f"  - Files created: {MODIFIED_COUNTS['created']}")
+        logging.info(f"  - Files modified: {MODIFIED_COUNTS['modified']}")
+        logging.info(f"  - Attachments moved: {MODIFIED_COUNTS['attachments_moved']}")
         logging.info(
-            f"  - Attachments moved: {len(MODIFIED_FILES['attachments_moved'])}"
-        )
-        logging.info(
-            f"A list of all modified files has been saved to migration_modified_files_*.json"
+            f"A list of all modified files has been saved to migration_modified_files_*.jsonl"
         )
 
     if dry_run:
@@ -438,9 +567,6 @@ def migrate_files(source_dir, dry_run=False, skip_attachments=False):
 
 
 if __name__ == "__main__":
-    # Initialize mimetypes
-    mimetypes.init()
-
     # Parse command line arguments
     parser = setup_argument_parser()
     args = parser.parse_args()
@@ -451,6 +577,12 @@ if __name__ == "__main__":
     logging.info(f"Starting migration from {source_dir}")
     logging.info(f"Dry run: {args.dry_run}")
     logging.info(f"Skip attachments: {args.skip_attachments}")
+    logging.info(f"Preserve separate inodes: {args.preserve_separate_inode}")
 
     # Run the migration
-    migrate_files(source_dir, args.dry_run, args.skip_attachments)
+    migrate_files(
+        source_dir,
+        args.dry_run,
+        args.skip_attachments,
+        not args.preserve_separate_inode,
+    )
@@ -29,6 +29,7 @@ import os
 import re
 import shutil
 import logging
+import functools
 from datetime import datetime
 import argparse
 import mimetypes
@@ -84,6 +85,21 @@ FILE_TYPES = {
     "video": [".mp4", ".mov", ".avi", ".mkv", ".wmv", ".flv", ".webm", ".m4v"],
 }
 
+# Extension -> attachment type, built once from FILE_TYPES
+EXT_TO_TYPE = {
+    extension: file_type
+    for file_type, extensions in FILE_TYPES.items()
+    for extension in extensions
+}
+
+# Casefolded names already present in each destination directory, filled in
+# by get_directory_listing and kept up to date as files are placed there
+DEST_DIR_LISTINGS = {}
+
+# Destination directories already known to exist (or, in a dry run, already
+# reported), so each one is checked only once per run
+ENSURED_DIRECTORIES = set()
+
 # Track files for reporting
 PROCESSED_FILES = {
     "moved": [],  # Successfully moved files
@@ -108,12 +124,23 @@ def get_attachment_type(file_path):
     """Determine the attachment type based on file extension."""
     extension = os.path.splitext(file_path)[1].lower()
 
-    for file_type, extensions in FILE_TYPES.items():
-        if extension in extensions:
-            return file_type
+    file_type = EXT_TO_TYPE.get(extension)
+    if file_type:
+        return file_type
 
     # If extension not in predefined list, use mimetypes
-    mime_type, _ = mimetypes.guess_type(file_path)
+    return guess_attachment_type(extension)
+
+
+@functools.lru_cache(maxsize=None)
+def guess_attachment_type(extension):
+    """
+    Determine the attachment type of an unlisted extension from its MIME type.
+
+    mimetypes reads the system MIME type files on its first guess_type call,
+    so runs where every extension is in FILE_TYPES never load them.
+    """
+    mime_type, _ = mimetypes.guess_type("attachment" + extension)
     if mime_type:
         if mime_type.startswith("audio/"):
             return "audio"
@@ -128,8 +155,30 @@ def get_attachment_type(file_path):
     return "document"
 
 
+def get_directory_listing(directory_path):
+    """
+    Return the names in a destination directory, listed once per run.
+
+    Names are casefolded so conflicts are also detected on case-insensitive
+    filesystems (the macOS default). The set is cached in DEST_DIR_LISTINGS and
+    callers add the names of files they place there, so later conflict checks
+    need no filesystem calls.
+    """
+    listing = DEST_DIR_LISTINGS.get(directory_path)
+    if listing is None:
+        try:
+            with os.scandir(directory_path) as entries:
+                listing = {entry.name.casefold() for entry in entries}
+        except FileNotFoundError:
+            listing = set()
+        DEST_DIR_LISTINGS[directory_path] = listing
+    return listing
+
+
 def ensure_directory_exists(directory_path, dry_run=False):
     """Ensure the directory exists, create if it doesn't."""
+    if directory_path in ENSURED_DIRECTORIES:
+        return True
     if not os.path.exists(directory_path):
         if dry_run:
             logging.info(f"Would create directory: {directory_path}")
@@ -140,6 +189,7 @@ def ensure_directory_exists(directory_path, dry_run=False):
             except Exception as e:
                 logging.error(f"Failed to create directory {directory_path}: {str(e)}")
                 return False
+    ENSURED_DIRECTORIES.add(directory_path)
     return True
 
 
@@ -170,10 +220,11 @@ def process_attachment_file(file_path, dry_run=False):
         )
         return False
 
-    # Handle filename conflict
+    # Handle filename conflict (checked against the cached directory listing)
+    existing_names = get_directory_listing(dest_dir)
     counter = 1
     original_filename = filename
-    while os.path.exists(dest_path) and not dry_run:
+    while filename.casefold() in existing_names and not dry_run:
         name, ext = os.path.splitext(original_filename)
         filename = f"{name}_{counter}{ext}"
         dest_path = os.path.join(dest_dir, filename)
@@ -186,6 +237,7 @@ def process_attachment_file(file_path, dry_run=False):
         else:
             # Actually move the file instead of copying
             shutil.move(file_path, dest_path)
+            existing_names.add(filename.casefold())
             logging.info(f"Moved attachment: {file_path} → {dest_path}")
             # Track the moved file
             PROCESSED_FILES["moved"].append(f"{file_path} → {dest_path}")
@@ -302,9 +354,6 @@ def organize_attachments(vault_dir, dry_run=False):
 
 
 if __name__ == "__main__":
-    # Initialize mimetypes
-    mimetypes.init()
-
     # Parse command line arguments
     parser = setup_argument_parser()
     args = parser.parse_args()
@@ -5,8 +5,9 @@
 This script is designed to clean up backup files within an Obsidian vault. It identifies all files with a `.bak` extension and removes them if a corresponding original file exists. This helps in maintaining a clean and organized vault by eliminating unnecessary backup files.
 
 ## Technical Implementation
-- The script searches recursively through the specified vault directory for files ending with `.bak`.
-- For each backup file found, it checks if the original file (same name without the `.bak` extension) exists.
+- The script walks the specified vault directory once with os.scandir, collecting files ending
+  with `.bak` and the set of all paths in the vault (hidden files and directories are skipped).
+- For each backup file found, it checks that set for the original file (same name without the `.bak` extension).
 - If the original file exists, the backup file is deleted.
 - If the original file does not exist, the backup file is retained.
 - The script can be run in a "dry run" mode where it simulates the deletion process without actually removing any files.
@@ -21,18 +22,58 @@ Optional flags:
 
 ## Dependencies
 - os: For file operations and path handling
-- glob: For finding files recursively
 - argparse: For command-line argument parsing
 """
 
 import os
-import glob
 from pathlib import Path
 
 # Define the root directory of your Obsidian vault - change this to your vault path
 VAULT_PATH = "/Users/danildanilov/Obsidian"  # Update this path
 
 
+def iter_vault_entries(root_dir):
+    """
+    Recursively yield the directory entries of everything below a directory.
+
+    Uses os.scandir so type checks come from the cached directory entries.
+    Hidden files and directories are skipped, like the recursive glob did.
+
+    Args:
+        root_dir: Directory to scan
+
+    Yields:
+        os.DirEntry for each file and directory found
+    """
+    try:
+        entries = os.scandir(root_dir)
+    except OSError as e:
+        # Unreadable directories are skipped, as the recursive glob did
+        print(f"Warning: Could not read directory {root_dir}: {e}")
+        return
+    with entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            yield entry
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_vault_entries(entry.path)
+
+
+def relative_to_vault(file_path, vault_path):
+    """
+    Return a path relative to the vault by slicing off the vault prefix.
+
+    Paths produced by the scan always start with the vault path, so string
+    slicing gives the same result as os.path.relpath without its abspath and
+    getcwd calls. Other paths are returned unchanged.
+    """
+    prefix = vault_path.rstrip(os.sep) + os.sep
+    if file_path.startswith(prefix):
+        return file_path[len(prefix) :]
+    return file_path
+
+
 def find_and_remove_backup_files(vault_path, dry_run=False):
     """
     Find all .bak files and remove those that have a corresponding original file.
@@ -41,8 +82,15 @@ def find_and_remove_backup_files(vault_path, dry_run=False):
         vault_path: Path to the Obsidian vault
         dry_run: If True, only simulate deletion without actually removing files
     """
-    # Find all backup files
-    backup_files = glob.glob(f"{vault_path}/**/*.bak", recursive=True)
+    # One pass over the vault finds the backup files and records every path
+    # that exists, so originals are looked up in memory instead of with a
+    # stat per backup
+    existing_paths = set()
+    backup_files = []
+    for entry in iter_vault_entries(vault_path):
+        existing_paths.add(entry.path)
+        if entry.name.endswith(".bak") and entry.is_file():
+            backup_files.append(entry.path)
 
     total_backups = len(backup_files)
     print(f"Found {total_backups} backup files.")
@@ -55,23 +103,23 @@ def find_and_remove_backup_files(vault_path, dry_run=False):
         original_path = backup_path[:-4]  # Remove .bak extension
 
         # Check if original file exists
-        if os.path.exists(original_path):
+        if original_path in existing_paths:
             # Original exists, so this backup can be deleted
             if not dry_run:
                 try:
                     os.remove(backup_path)
                     deleted_files.append(backup_path)
-                    print(f"Deleted: {os.path.relpath(backup_path, vault_path)}")
+                    print(f"Deleted: {relative_to_vault(backup_path, vault_path)}")
                 except Exception as e:
                     print(f"Error deleting {backup_path}: {e}")
             else:
                 deleted_files.append(backup_path)
-                print(f"Would delete: {os.path.relpath(backup_path, vault_path)}")
+                print(f"Would delete: {relative_to_vault(backup_path, vault_path)}")
         else:
             # No original, keep the backup
             kept_files.append(backup_path)
             print(
-                f"Keeping: {os.path.relpath(backup_path, vault_path)} (no original file)"
+                f"Keeping: {relative_to_vault(backup_path, vault_path)} (no original file)"
             )
 
     # Summary
@@ -85,7 +133,7 @@ def find_and_remove_backup_files(vault_path, dry_run=False):
     if kept_files:
         print("\nBackup files kept (no original file exists):")
         for file_path in kept_files:
-            print(f"  - {os.path.relpath(file_path, vault_path)}")
+            print(f"  - {relative_to_vault(file_path, vault_path)}")
 
     return deleted_files, kept_files
 
@@ -10,10 +10,15 @@ It transforms patterns like:
 The script preserves the note name while removing the folder path structure.
 
 ## Technical Implementation
-- Uses recursive globbing to find all Markdown (.md) files in the vault
+- Walks the vault with os.scandir to find all Markdown (.md) files, skipping
+  hidden files and directories
 - Applies regex pattern matching to identify wikilinks with folder paths
 - Extracts just the note name (last component after the final slash)
-- Creates backups of modified files with .backup extension (optional)
+- Creates backups of modified files with .backup extension (optional; hardlinks where
+  possible, files are rewritten via a temporary file and os.replace so backups keep
+  the original)
+- Processes files in parallel: a pool of worker processes (one per CPU core), or
+  threads for a dry run
 - Generates a summary report of changes made
 - Simple implementation that skips problematic files
 
@@ -31,21 +36,136 @@ Optional flags:
 ## Dependencies
 - os: For file operations and path handling
 - re: For regular expression pattern matching
-- glob: For finding files recursively
+- shutil: For copying backups where hardlinks are unavailable
 - argparse: For command-line argument parsing
+- functools, concurrent.futures: For processing files in parallel
 """
 
 import os
 import re
-import glob
+import shutil
 import argparse
+import functools
+import concurrent.futures
 from datetime import datetime
 
 # Define the root directory of your Obsidian vault
 VAULT_PATH = "/Users/danildanilov/Obsidian"
 
+# Number of threads used for a dry run (real runs use one process per CPU core)
+MAX_THREADS = 16
+
 # Regex pattern to match wikilinks with folder paths and capture the note name
 WIKILINK_PATTERN = r"\[\[([^|\]]*?/+)([^/\]|]+)(?:\|[^|\]]*?)?\]\]"
+WIKILINK_RE = re.compile(WIKILINK_PATTERN)
+
+
+def simplify_match(match):
+    """
+    Build the simplified wikilink for a WIKILINK_RE match, keeping any alias.
+
+    Args:
+        match (re.Match): A full-path wikilink match
+
+    Returns:
+        str: The wikilink with only the note name (and alias, if any)
+    """
+    full_match = match.group(0)  # The entire match including [[]]
+    note_name = match.group(2)  # Just the note name
+
+    # Check if there's a pipe in the original (indicating an alias)
+    pipe_index = full_match.find("|")
+    if pipe_index != -1:
+        return f"[[{note_name}{full_match[pipe_index:-2]}]]"
+    return f"[[{note_name}]]"
+
+
+def iter_markdown_files(root_dir):
+    """
+    Recursively yield the paths of all Markdown files below a directory.
+
+    Uses os.scandir so type checks come from the cached directory entries
+    instead of extra stat calls. Hidden files and directories (e.g. .obsidian,
+    .trash) are skipped, like the recursive glob did; symlinked directories
+    are not followed.
+
+    Args:
+        root_dir (str): Directory to scan
+
+    Yields:
+        str: Path of each markdown file found
+    """
+    try:
+        entries = os.scandir(root_dir)
+    except OSError as e:
+        # Unreadable directories are skipped, as the recursive glob did
+        print(f"Warning: Could not read directory {root_dir}: {e}")
+        return
+    with entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_markdown_files(entry.path)
+            elif entry.name.endswith(".md") and entry.is_file():
+                yield entry.path
+
+
+def relative_to_vault(file_path):
+    """
+    Return a file's path relative to VAULT_PATH for messages.
+
+    Every path comes from scanning VAULT_PATH, so slicing off the prefix is
+    enough; os.path.relpath would also call abspath and getcwd per file.
+    """
+    prefix = VAULT_PATH + os.sep
+    if file_path.startswith(prefix):
+        return file_path[len(prefix) :]
+    return file_path
+
+
+def link_backup(file_path, backup_path):
+    """
+    Create a backup of a file as a hardlink, falling back to a copy.
+
+    A hardlink shares the original's data, so no bytes are written. This is
+    only safe because files are rewritten with replace_file_content, which
+    swaps in a new inode instead of writing into the linked one.
+
+    Args:
+        file_path (str): Path to the file to back up
+        backup_path (str): Path of the backup to create
+    """
+    # Replace any backup left over from a previous run
+    if os.path.lexists(backup_path):
+        os.remove(backup_path)
+    try:
+        os.link(file_path, backup_path)
+    except OSError:
+        # Hardlinks unsupported (cross-device, some synced/network filesystems)
+        shutil.copyfile(file_path, backup_path)
+        shutil.copystat(file_path, backup_path)
+
+
+def replace_file_content(file_path, content):
+    """
+    Replace a file's content by writing a temporary file and renaming it over
+    the original with os.replace, so the file is never left half-written.
+
+    Args:
+        file_path (str): Path to the file to overwrite
+        content (str): New file content
+    """
+    tmp_path = file_path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="") as file:
+            file.write(content)
+        shutil.copymode(file_path, tmp_path)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
 def simplify_wikilinks(file_path, create_backup=True, dry_run=False, max_size_kb=1000):
@@ -58,75 +178,60 @@ def simplify_wikilinks(file_path, create_backup=True, dry_run=False, max_size_kb
         dry_run (bool): If True, only simulate changes without writing to files
         max_size_kb (int): Maximum file size to process in KB
 
+    Output is collected rather than printed so the function can run in a
+    worker process or thread; the caller prints the returned messages in file
+    order.
+
     Returns:
-        tuple: (bool indicating if file was modified, int count of wikilinks simplified)
+        tuple: (bool indicating if file was modified, int count of wikilinks simplified,
+                list of messages to print)
     """
-    # Check file size first
+    messages = []
     try:
-        file_size_kb = os.path.getsize(file_path) / 1024
-        if file_size_kb > max_size_kb:
-            print(
-                f"Skipping large file ({file_size_kb:.1f} KB): {os.path.relpath(file_path, VAULT_PATH)}"
-            )
-            return False, 0
+        with open(file_path, "rb") as file:
+            # Check file size first, on the open handle rather than a second
+            # lookup by path
+            file_size_kb = os.fstat(file.fileno()).st_size / 1024
+            if file_size_kb > max_size_kb:
+                messages.append(
+                    f"Skipping large file ({file_size_kb:.1f} KB): {relative_to_vault(file_path)}"
+                )
+                return False, 0, messages
 
-        with open(file_path, "r", encoding="utf-8") as file:
-            content = file.read()
+            raw = file.read()
 
-        # Find all wikilinks with paths
-        matches = []
-        replacements = []
+        # A path-style wikilink needs both "[[" and "/"; checking the bytes
+        # skips decoding and the regex for the many notes without one
+        if b"[[" not in raw or b"/" not in raw:
+            return False, 0, messages
+        content = raw.decode("utf-8")
 
-        for match in re.finditer(WIKILINK_PATTERN, content):
-            full_match = match.group(0)  # The entire match including [[]]
-            note_name = match.group(2)  # Just the note name
+        # Replace full-path wikilinks with simplified versions in one pass
+        modified_content, link_count = WIKILINK_RE.subn(simplify_match, content)
 
-            # Check if there's a pipe in the original (indicating an alias)
-            if "|" in full_match:
-                pipe_index = full_match.index("|")
-                closing_index = full_match.rindex("]]")
-                alias_part = full_match[pipe_index:closing_index]
-                simplified = f"[[{note_name}{alias_part}"
-            else:
-                simplified = f"[[{note_name}]]"
+        # Every simplified link drops its folder path, so a non-zero count
+        # means the content changed (no need to compare the whole text)
+        if link_count == 0:
+            return False, 0, messages
 
-            matches.append(full_match)
-            replacements.append(simplified)
+        if not dry_run:
+            # Create backup if requested
+            if create_backup:
+                link_backup(file_path, file_path + ".backup")
 
-        link_count = len(matches)
+            # Write modified content
+            replace_file_content(file_path, modified_content)
 
-        if link_count == 0:
-            return False, 0
-
-        # Replace full-path wikilinks with simplified versions
-        modified_content = content
-        for i in range(link_count):
-            modified_content = modified_content.replace(matches[i], replacements[i])
-
-        # Check if content was modified
-        if content != modified_content:
-            if not dry_run:
-                # Create backup if requested
-                if create_backup:
-                    backup_path = file_path + ".backup"
-                    with open(backup_path, "w", encoding="utf-8") as backup_file:
-                        backup_file.write(content)
-
-                # Write modified content
-                with open(file_path, "w", encoding="utf-8") as file:
-                    file.write(modified_content)
-
-                # Report modification
-                print(
-                    f"Modified: {os.path.relpath(file_path, VAULT_PATH)} - simplified {link_count} wikilinks"
-                )
+            # Report modification
+            messages.append(
+                f"Modified: {relative_to_vault(file_path)} - simplified {link_count} wikilinks"
+            )
 
-            return True, link_count
-        return False, 0
+        return True, link_count, messages
 
     except Exception as e:
-        print(f"Skipping file {os.path.relpath(file_path, VAULT_PATH)}: {str(e)}")
-        return False, 0
+        messages.append(f"Skipping file {relative_to_vault(file_path)}: {str(e)}")
+        return False, 0, messages
 
 
 def process_vault(
@@ -145,11 +250,8 @@ def process_vault(
     Returns:
         tuple: (list of modified files, total wikilinks simplified, total files processed)
     """
-    # Find all markdown files
-    md_files = glob.glob(f"{VAULT_PATH}/**/*.md", recursive=True)
-
-    # Sort files for consistent processing order
-    md_files.sort()
+    # Find all markdown files, sorted for consistent processing order
+    md_files = sorted(iter_markdown_files(VAULT_PATH))
 
     # Apply start_at and max_files constraints
     if start_at > 0:
@@ -166,19 +268,42 @@ def process_vault(
     file_count = len(md_files)
     print(f"Found {file_count} markdown files to process")
 
-    for i, file_path in enumerate(md_files):
-        # Progress indicator
-        if i % 50 == 0 or i == file_count - 1:
-            print(
-                f"Processing file {i+1}/{file_count}... ({((i+1)/file_count)*100:.1f}%)"
-            )
-
-        was_modified, links_simplified = simplify_wikilinks(
-            file_path, create_backup, dry_run, max_size_kb
+    # Files are processed in worker processes (the regex work is CPU-bound);
+    # a dry run only reads, so threads are enough and avoid starting processes.
+    # Results come back in file order and are printed from here
+    if dry_run:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_THREADS)
+        chunksize = 1
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor()
+        chunksize = 64
+
+    with executor:
+        results = executor.map(
+            functools.partial(
+                simplify_wikilinks,
+                create_backup=create_backup,
+                dry_run=dry_run,
+                max_size_kb=max_size_kb,
+            ),
+            md_files,
+            chunksize=chunksize,
         )
-        if was_modified:
-            modified_files.append((file_path, links_simplified))
-            total_links_simplified += links_simplified
+        for i, (file_path, (was_modified, links_simplified, messages)) in enumerate(
+            zip(md_files, results)
+        ):
+            # Progress indicator
+            if i % 50 == 0 or i == file_count - 1:
+                print(
+                    f"Processing file {i+1}/{file_count}... ({((i+1)/file_count)*100:.1f}%)"
+                )
+
+            for message in messages:
+                print(message)
+
+            if was_modified:
+                modified_files.append((file_path, links_simplified))
+                total_links_simplified += links_simplified
 
     return modified_files, total_links_simplified, file_count
 
@@ -239,7 +364,7 @@ def main():
     if modified_files:
         print("\nModified files:")
         for file_path, links_simplified in modified_files:
-            rel_path = os.path.relpath(file_path, VAULT_PATH)
+            rel_path = relative_to_vault(file_path)
             print(f"  - {rel_path} ({links_simplified} links)")
 
     if args.dry_run:
@@ -7,8 +7,17 @@ sorted by frequency of use. This helps in planning a systematic conversion from
 tags to wikilinks by identifying which tags to prioritize.
 
 ## Technical Implementation
-- Uses recursive globbing to find all Markdown (.md) files in the vault
-- Uses regex to identify all #tags (including nested tags)
+- Walks the vault with os.scandir to find all Markdown (.md) files, pruning hidden
+  and excluded directories (EXCLUDED_DIRS, e.g. attachment folders) instead of
+  descending into them; files are handed to the workers as they are found
+- Uses regex to identify all #tags (including nested tags), matched against the raw
+  file bytes; Google RE2 is used for the matching when it is installed
+- Memory-maps large notes instead of reading them (with the standard re module), or
+  reads them in fixed-size chunks (with RE2), so memory use stays bounded
+- Scans files in a pool of worker processes (one per CPU core, at most
+  MAX_INFLIGHT_READS, so network-mounted vaults are not flooded with reads)
+- Caches each file's tags with its modification time and size in
+  .obsidian/tag_inventory.cache.json, so unchanged files are not read again
 - Counts occurrences of each tag and sorts by frequency
 - Generates a detailed report showing tag usage patterns
 - Creates a conversion plan Markdown file
@@ -21,27 +30,108 @@ Optional flags:
     --output: Custom path for the output report (default: "99 - Meta/Tag Conversion Plan.md")
     --min-count: Minimum number of occurrences to include in report (default: 1)
     --exclude-done: Exclude #done tags from the report
+    --force: Scan every file, even those unchanged since the last run
+    --exclude-dir: Another directory name to skip (can be given several times)
 
 ## Dependencies
 - os: For file operations and path handling
 - re: For regular expression pattern matching
-- glob: For finding files recursively
 - argparse: For command-line argument parsing
+- json: For the cache of per-file scan results
 - collections: For counting and sorting tags
+- mmap: For scanning large notes without reading them into memory
+- functools, itertools, multiprocessing: For scanning batches of files in parallel
+  worker processes
+- re2 (google-re2, optional): Faster tag matching than the standard re module
 """
 
 import os
 import re
-import glob
+import json
+import mmap
 import argparse
+import functools
+import itertools
+import multiprocessing
 from datetime import datetime
+from operator import itemgetter
 from collections import Counter
 
+# Google RE2 matches in linear time with a C++ inner loop; the standard re
+# module is used when it is not installed: pip install google-re2
+try:
+    import re2  # type: ignore
+except ImportError:
+    re2 = None
+
 # Define the root directory of your Obsidian vault
 VAULT_PATH = "/Users/danildanilov/Obsidian"
 
-# Regex pattern to match tags, including nested tags
+# Directories that are never searched for notes (hidden directories such as
+# .obsidian and .trash are always skipped); "99 - Files" holds the attachment
+# folders that organize_obsidian_attachments.py fills, which have no notes
+EXCLUDED_DIRS = {"node_modules", "__pycache__", "99 - Files"}
+
+# JSON map of relative path -> [mtime_ns, size, tag counts] from the last run; files
+# whose modification time and size still match are not scanned again
+CACHE_PATH = os.path.join(VAULT_PATH, ".obsidian", "tag_inventory.cache.json")
+
+# Regex pattern to match tags, including nested tags. It is ASCII-only, so it is
+# matched directly against the file bytes and only the matched tags are decoded
 TAG_PATTERN = r"#[a-zA-Z0-9_/.-]+"
+TAG_RE = (re2 or re).compile(TAG_PATTERN.encode("ascii"))
+
+# Characters that can follow the # of a tag (the character class of TAG_PATTERN)
+TAG_CHARS = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_/.-"
+
+# Upper bound on files being read at once (one per worker process). Synced and
+# network filesystems (iCloud, SMB, NFS) stall when many reads pile up on them
+MAX_INFLIGHT_READS = 16
+
+# Notes at least this large are not read into memory in one piece: they are
+# memory-mapped, or scanned SCAN_CHUNK_SIZE bytes at a time when RE2 is in use
+# (small notes are cheaper to read whole than to map or chunk)
+LARGE_NOTE_SIZE = 256 * 1024
+SCAN_CHUNK_SIZE = 1024 * 1024
+
+# Files scanned per worker task; each batch's tags are added up in the worker
+SCAN_BATCH_SIZE = 64
+
+# Write buffer for the report file, which is written in many small pieces
+REPORT_BUFFER_SIZE = 1024 * 1024
+
+
+def find_tags_in_chunks(file):
+    """
+    Find the tags in an open binary file, reading it SCAN_CHUNK_SIZE bytes at a time.
+
+    Each block is cut after its last byte that cannot be part of a tag, so no
+    tag is split between blocks and the matches are the same as for the whole
+    file. Only a tag still open at the end of the block ("#" plus tag
+    characters) is carried into the next one; trailing tag characters without
+    a "#" cannot start a match and are dropped. The carry is therefore bounded
+    by the length of one tag, even for a note without newlines.
+
+    Args:
+        file: File object opened in binary mode
+
+    Returns:
+        list: Tags found in the file, as bytes
+    """
+    tags = []
+    carry = b""
+    while True:
+        chunk = file.read(SCAN_CHUNK_SIZE)
+        if not chunk:
+            break
+        block = carry + chunk
+        cut = len(block.rstrip(TAG_CHARS))
+        if block[cut - 1 : cut] == b"#":
+            cut -= 1
+        tags.extend(TAG_RE.findall(block[:cut]))
+        carry = block[cut:] if block[cut : cut + 1] == b"#" else b""
+    tags.extend(TAG_RE.findall(carry))
+    return tags
 
 
 def scan_file_for_tags(file_path):
@@ -52,136 +142,339 @@ def scan_file_for_tags(file_path):
         file_path (str): Path to the markdown file
 
     Returns:
-        list: List of tags found in the file
+        list: List of tags found in the file, or None if it could not be read
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            content = file.read()
-
-        # Find all tags using regex
-        tags = re.findall(TAG_PATTERN, content)
-        return tags
+        # Match against bytes: the file is never decoded, only the tags found in it
+        with open(file_path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < LARGE_NOTE_SIZE:
+                tags = TAG_RE.findall(file.read())
+            elif re2 is None:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    tags = TAG_RE.findall(mapped)
+            else:
+                # RE2's Python binding only accepts bytes or str, not a mapping
+                tags = find_tags_in_chunks(file)
+
+        return [tag.decode("ascii") for tag in tags]
 
     except Exception as e:
         print(f"Error processing {file_path}: {str(e)}")
-        return []
+        return None
 
 
-def inventory_tags(exclude_done=False):
+def scan_batch(tasks, exclude_done=False):
     """
-    Create a complete inventory of all tags in the vault.
+    Scan a batch of (path, relative path, stat key) tasks in a worker process.
+
+    The batch's tags are added up here, so the main process merges one
+    Counter per batch instead of one per file. Each file's own counts (much
+    smaller than the list of every occurrence) are returned for the cache.
 
     Args:
-        exclude_done (bool): Whether to exclude #done tags from the inventory
+        tasks (list): Tasks from iter_scan_tasks
+        exclude_done (bool): Whether to leave #done tags out of the batch total
 
     Returns:
-        tuple: (Counter object with tag counts, total number of files processed)
+        tuple: (number of files in the batch, Counter of the batch's tags,
+                list of (relative path, stat key, dict of tag -> count) for the
+                files that could be read)
+    """
+    batch_counter = Counter()
+    scanned = []
+    for file_path, rel_path, stat_key in tasks:
+        tags = scan_file_for_tags(file_path)
+        # Unreadable files count as having no tags and are not cached
+        if tags is None:
+            continue
+        file_tags = dict(Counter(tags))
+        add_tag_counts(batch_counter, file_tags, exclude_done)
+        scanned.append((rel_path, stat_key, file_tags))
+    return len(tasks), batch_counter, scanned
+
+
+def iter_batches(items, size):
+    """Yield lists of up to size consecutive items from an iterable."""
+    items = iter(items)
+    while True:
+        batch = list(itertools.islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_markdown_files(root_dir, excluded_dirs):
     """
-    # Find all markdown files
-    md_files = glob.glob(f"{VAULT_PATH}/**/*.md", recursive=True)
+    Recursively yield the directory entries of all Markdown files below a directory.
 
-    tag_counter = Counter()
-    file_count = len(md_files)
+    Uses os.scandir so type checks come from the cached directory entries
+    instead of extra stat calls. Hidden directories (e.g. .obsidian, .trash)
+    and excluded directories are pruned without being listed; hidden files
+    are skipped, like the recursive glob did.
 
-    print(f"Scanning {file_count} markdown files for tags...")
+    Args:
+        root_dir (str): Directory to scan
+        excluded_dirs (set): Directory names that are not descended into
 
-    for i, file_path in enumerate(md_files):
-        # Progress indicator
-        if i % 100 == 0:
-            print(
-                f"Processing file {i+1}/{file_count}... ({((i+1)/file_count)*100:.1f}%)"
-            )
+    Yields:
+        os.DirEntry: Entry of each markdown file found
+    """
+    try:
+        entries = os.scandir(root_dir)
+    except OSError as e:
+        # Unreadable directories are skipped, as the recursive glob did
+        print(f"Warning: Could not read directory {root_dir}: {e}")
+        return
+    with entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in excluded_dirs:
+                    yield from iter_markdown_files(entry.path, excluded_dirs)
+            elif entry.name.endswith(".md") and entry.is_file():
+                yield entry
+
+
+def iter_scan_tasks(cache, reused, excluded_dirs, force=False):
+    """
+    Yield a scan task for every markdown file whose cached tags are out of date.
 
-        file_tags = scan_file_for_tags(file_path)
+    Files whose modification time and size match their cache entry are not
+    scanned again; their (relative path, cache entry) pairs are appended to
+    reused instead. This runs in the pool's task-feeding thread, so it only
+    reads the cache and appends to a list.
 
-        # Filter out #done tags if requested
-        if exclude_done:
-            file_tags = [tag for tag in file_tags if not tag.startswith("#done")]
+    Args:
+        cache (dict): Relative path -> [mtime_ns, size, tag counts] from the last run
+        reused (list): Receives (relative path, cache entry) for unchanged files
+        excluded_dirs (set): Directory names that are not searched
+        force (bool): If True, scan every file regardless of the cache
 
-        tag_counter.update(file_tags)
+    Yields:
+        tuple: (path, relative path, [mtime_ns, size] or None if unknown)
+    """
+    prefix_len = len(VAULT_PATH) + 1
+    for entry in iter_markdown_files(VAULT_PATH, excluded_dirs):
+        rel_path = entry.path[prefix_len:]
+        try:
+            stat = entry.stat()
+        except OSError:
+            yield entry.path, rel_path, None
+            continue
+        stat_key = [stat.st_mtime_ns, stat.st_size]
+        cached = cache.get(rel_path)
+        if (
+            not force
+            and isinstance(cached, list)
+            and len(cached) == 3
+            and isinstance(cached[2], dict)
+            and cached[:2] == stat_key
+        ):
+            reused.append((rel_path, cached))
+        else:
+            yield entry.path, rel_path, stat_key
 
-    return tag_counter, file_count
 
+def load_cache():
+    """
+    Load the relative path -> [mtime_ns, size, tag counts] map saved by the previous run.
 
-def generate_tag_report(tag_counter, file_count, min_count=1):
+    Returns:
+        dict: The cached scan results, or an empty dict if there is no usable cache
     """
-    Generate a Markdown report of tag usage.
+    try:
+        with open(CACHE_PATH, "r", encoding="utf-8") as file:
+            cache = json.load(file)
+        return cache if isinstance(cache, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Warning: Could not read cache file {CACHE_PATH}: {str(e)}")
+        return {}
+
+
+def save_cache(cache):
+    """Save the relative path -> [mtime_ns, size, tag counts] map for the next run."""
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(CACHE_PATH, "w", encoding="utf-8") as file:
+            json.dump(cache, file, separators=(",", ":"))
+    except Exception as e:
+        print(f"Warning: Could not save cache file {CACHE_PATH}: {str(e)}")
+
+
+def add_tag_counts(tag_counter, file_tags, exclude_done=False):
+    """
+    Add one file's tag counts to the inventory.
 
     Args:
-        tag_counter (Counter): Counter object with tag counts
-        file_count (int): Total number of files processed
-        min_count (int): Minimum count to include in report
+        tag_counter (Counter): Inventory to update
+        file_tags (dict): Tag -> number of occurrences in the file
+        exclude_done (bool): Whether to leave out #done tags
+    """
+    # Filter out #done tags if requested
+    if exclude_done:
+        file_tags = {
+            tag: count
+            for tag, count in file_tags.items()
+            if not tag.startswith("#done")
+        }
+    tag_counter.update(file_tags)
+
+
+def inventory_tags(exclude_done=False, force=False, excluded_dirs=EXCLUDED_DIRS):
+    """
+    Create a complete inventory of all tags in the vault.
+
+    Args:
+        exclude_done (bool): Whether to exclude #done tags from the inventory
+        force (bool): If True, scan every file, even those unchanged since the last run
+        excluded_dirs (set): Directory names that are not searched
 
     Returns:
-        str: Markdown-formatted report
+        tuple: (Counter object with tag counts, total number of files processed)
+    """
+    tag_counter = Counter()
+    file_count = 0
+
+    # Tags found by previous runs; only the files seen in this run are kept
+    cache = load_cache()
+    new_cache = {}
+    reused = []
+
+    print("Scanning markdown files for tags...")
+
+    # Files are independent, so they are read and scanned in worker processes.
+    # The vault walk feeds the pool directly, so scanning starts while the walk
+    # is still running (the total is only known at the end); results arrive in
+    # completion order and are counted here
+    workers = min(os.cpu_count() or 1, MAX_INFLIGHT_READS)
+    with multiprocessing.Pool(workers) as pool:
+        results = pool.imap_unordered(
+            functools.partial(scan_batch, exclude_done=exclude_done),
+            iter_batches(
+                iter_scan_tasks(cache, reused, excluded_dirs, force), SCAN_BATCH_SIZE
+            ),
+        )
+        for batch_size, batch_counter, scanned in results:
+            # Progress indicator (about every 100 files)
+            if file_count // 100 != (file_count + batch_size) // 100:
+                print(f"Processed {file_count + batch_size} files...")
+            file_count += batch_size
+
+            tag_counter.update(batch_counter)
+            for rel_path, stat_key, file_tags in scanned:
+                if stat_key is not None:
+                    new_cache[rel_path] = stat_key + [file_tags]
+
+    # Count the tags of files that were unchanged since the last run
+    if reused:
+        print(f"Reused cached tags for {len(reused)} unchanged files")
+    for rel_path, cached in reused:
+        new_cache[rel_path] = cached
+        add_tag_counts(tag_counter, cached[2], exclude_done)
+
+    save_cache(new_cache)
+
+    return tag_counter, file_count + len(reused)
+
+
+def generate_tag_report(tag_counter, file_count, out_file, min_count=1):
     """
-    # Filter tags by minimum count
-    filtered_tags = {
-        tag: count for tag, count in tag_counter.items() if count >= min_count
-    }
+    Write a Markdown report of tag usage.
+
+    The report is written piece by piece as it is generated, so it is never
+    held in memory as a whole.
 
-    # Sort tags by count (descending) and then alphabetically
-    sorted_tags = sorted(filtered_tags.items(), key=lambda x: (-x[1], x[0]))
+    Args:
+        tag_counter (Counter): Counter object with tag counts
+        file_count (int): Total number of files processed
+        out_file: Text file to write the report to
+        min_count (int): Minimum count to include in report
+    """
+    # One pass over the counted tags filters them by minimum count and groups
+    # every tag under its root tag for the hierarchy analysis
+    filtered_tags = []
+    root_tags = {}
+    for tag, count in tag_counter.items():
+        if count >= min_count:
+            filtered_tags.append((tag, count))
+        # partition only splits at the first "/", without building a list
+        root, nested, _ = tag.partition("/")
+        nested_tags = root_tags.setdefault(root, [])
+        if nested:
+            nested_tags.append(tag)
+
+    # Sort tags by count (descending) and then alphabetically: sort by name,
+    # then by count alone (the sort is stable, so equal counts stay in name
+    # order), which avoids building a (-count, tag) key tuple for every tag
+    sorted_tags = sorted(filtered_tags)
+    sorted_tags.sort(key=itemgetter(1), reverse=True)
 
     # Generate report
-    report = "# Tag to Wikilink Conversion Plan\n\n"
-    report += f"*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n\n"
-    report += f"## Summary\n\n"
-    report += f"- Total files scanned: {file_count}\n"
-    report += f"- Unique tags found: {len(tag_counter)}\n"
-    report += f"- Tags with at least {min_count} occurrences: {len(filtered_tags)}\n\n"
+    out_file.write("# Tag to Wikilink Conversion Plan\n\n")
+    out_file.write(f"*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n\n")
+    out_file.write(f"## Summary\n\n")
+    out_file.write(f"- Total files scanned: {file_count}\n")
+    out_file.write(f"- Unique tags found: {len(tag_counter)}\n")
+    out_file.write(
+        f"- Tags with at least {min_count} occurrences: {len(filtered_tags)}\n\n"
+    )
 
     # Add tag hierarchy analysis
-    root_tags = {}
-    for tag in tag_counter.keys():
-        parts = tag.split("/")
-        root = parts[0]
-        if root not in root_tags:
-            root_tags[root] = []
-        if len(parts) > 1:
-            root_tags[root].append(tag)
-
-    report += f"## Tag Hierarchies\n\n"
+    out_file.write(f"## Tag Hierarchies\n\n")
     for root, nested_tags in sorted(root_tags.items()):
-        report += f"### {root}\n\n"
+        out_file.write(f"### {root}\n\n")
         if nested_tags:
-            report += "Nested tags:\n"
+            out_file.write("Nested tags:\n")
             for tag in sorted(nested_tags):
-                report += f"- {tag} ({tag_counter[tag]} occurrences)\n"
+                out_file.write(f"- {tag} ({tag_counter[tag]} occurrences)\n")
         else:
-            report += f"No nested tags. Root occurrence count: {tag_counter[root]}\n"
-        report += "\n"
+            out_file.write(
+                f"No nested tags. Root occurrence count: {tag_counter[root]}\n"
+            )
+        out_file.write("\n")
 
     # Add detailed tag list
-    report += f"## Complete Tag List (sorted by frequency)\n\n"
-    report += "| Tag | Occurrences | Suggested Wikilink | Status |\n"
-    report += "|-----|-------------|-------------------|--------|\n"
-
-    for tag, count in sorted_tags:
-        # Create suggested wikilink name
-        suggested_wikilink = tag.replace("#", "").replace("/", " - ")
-        report += f"| `{tag}` | {count} | [[{suggested_wikilink}]] | 🔄 To Convert |\n"
+    out_file.write(f"## Complete Tag List (sorted by frequency)\n\n")
+    out_file.write("| Tag | Occurrences | Suggested Wikilink | Status |\n")
+    out_file.write("|-----|-------------|-------------------|--------|\n")
+
+    # One row per tag, with the suggested wikilink name built from the tag
+    # (TAG_PATTERN allows "#" only as the first character, so slicing it off
+    # saves a second pass over the tag)
+    out_file.writelines(
+        f"| `{tag}` | {count} | [[{tag[1:].replace('/', ' - ')}]] | 🔄 To Convert |\n"
+        for tag, count in sorted_tags
+    )
 
     # Add conversion instructions
-    report += "\n## Conversion Instructions\n\n"
-    report += (
+    out_file.write("\n## Conversion Instructions\n\n")
+    out_file.write(
         "1. Review the tag list above and adjust the suggested wikilinks as needed\n"
     )
-    report += "2. For each tag, create a corresponding note (if it doesn't exist)\n"
-    report += "3. Use the `convert_tags_to_wikilinks.py` script to convert each tag\n"
-    report += "4. Update the Status column in this document as you go\n"
-
-    return report
+    out_file.write(
+        "2. For each tag, create a corresponding note (if it doesn't exist)\n"
+    )
+    out_file.write(
+        "3. Use the `convert_tags_to_wikilinks.py` script to convert each tag\n"
+    )
+    out_file.write("4. Update the Status column in this document as you go\n")
 
 
-def save_report(report, output_path):
-    """Save the tag report to the specified file."""
+def save_report(tag_counter, file_count, output_path, min_count=1):
+    """Generate the tag report straight into the specified file."""
     try:
         # Create directories if they don't exist
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-        with open(output_path, "w", encoding="utf-8") as file:
-            file.write(report)
+        # A large write buffer lets the many small report pieces reach the
+        # file in few write calls
+        with open(
+            output_path, "w", encoding="utf-8", buffering=REPORT_BUFFER_SIZE
+        ) as file:
+            generate_tag_report(tag_counter, file_count, file, min_count)
 
         print(f"\nTag inventory report saved to: {output_path}")
         return True
@@ -209,20 +502,35 @@ def main():
     parser.add_argument(
         "--exclude-done", action="store_true", help="Exclude #done tags from the report"
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Scan every file, even those unchanged since the last run",
+    )
+    parser.add_argument(
+        "--exclude-dir",
+        action="append",
+        default=[],
+        metavar="NAME",
+        help="Another directory name to skip, in addition to "
+        + ", ".join(sorted(EXCLUDED_DIRS))
+        + " (can be given several times)",
+    )
     args = parser.parse_args()
 
     print("Starting tag inventory...")
 
     start_time = datetime.now()
-    tag_counter, file_count = inventory_tags(args.exclude_done)
+    tag_counter, file_count = inventory_tags(
+        args.exclude_done, args.force, EXCLUDED_DIRS | set(args.exclude_dir)
+    )
     end_time = datetime.now()
 
     print(f"\nFound {len(tag_counter)} unique tags across {file_count} files")
     print(f"Time taken: {end_time - start_time}")
 
     # Generate and save the report
-    report = generate_tag_report(tag_counter, file_count, args.min_count)
-    save_report(report, args.output)
+    save_report(tag_counter, file_count, args.output, args.min_count)
 
     # Show top 10 tags as a preview
     print("\nTop 10 most common tags:")
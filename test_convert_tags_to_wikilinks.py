@@ -0,0 +1,81 @@
+"""
+Tests for the YAML frontmatter conversion in convert_tags_to_wikilinks.py.
+
+Run with:
+    python -m unittest test_convert_tags_to_wikilinks
+"""
+
+import unittest
+
+import yaml
+
+from convert_tags_to_wikilinks import convert_yaml_tags
+
+
+class ConvertYamlTagsTest(unittest.TestCase):
+    def test_keeps_comments_and_unrelated_keys(self):
+        frontmatter = (
+            "---\n"
+            "title: 'My Note'  # shown in the graph\n"
+            "# reviewed weekly\n"
+            "aliases: [[Other Note]]\n"
+            "related: [[Note]]\n"
+            "tags:\n"
+            "  - project/alpha\n"
+            "  - misc\n"
+            "date_created_at: 2024-01-01\n"
+            "---"
+        )
+
+        converted, count = convert_yaml_tags(frontmatter, {"#project/alpha": "Alpha"})
+
+        self.assertEqual(count, 1)
+        self.assertEqual(
+            converted,
+            "---\n"
+            "title: 'My Note'  # shown in the graph\n"
+            "# reviewed weekly\n"
+            "aliases: [[Other Note]]\n"
+            "related:\n"
+            "  - '[[Note]]'\n"
+            "  - '[[Alpha]]'\n"
+            "tags:\n"
+            "  - misc\n"
+            "date_created_at: 2024-01-01\n"
+            "---",
+        )
+        meta = yaml.safe_load(converted[3:-3])
+        self.assertEqual(meta["related"], ["[[Note]]", "[[Alpha]]"])
+
+    def test_appends_related_block_when_missing(self):
+        frontmatter = "---\n# keep\ntags: [area, misc]\n---"
+
+        converted, count = convert_yaml_tags(frontmatter, {"#area": "Area"})
+
+        self.assertEqual(count, 1)
+        self.assertEqual(
+            converted,
+            "---\n# keep\ntags:\n  - misc\nrelated:\n  - '[[Area]]'\n---",
+        )
+
+    def test_converts_unquoted_hash_tag_items(self):
+        frontmatter = "---\ntags:\n  - #area\n  - misc  # keep\n  - #other\n---"
+
+        converted, count = convert_yaml_tags(frontmatter, {"#area": "Area"})
+
+        self.assertEqual(count, 1)
+        self.assertEqual(
+            converted,
+            "---\ntags:\n  - misc  # keep\n  - #other\nrelated:\n  - '[[Area]]'\n---",
+        )
+
+    def test_unmatched_tags_leave_frontmatter_untouched(self):
+        frontmatter = "---\ntags:\n  - misc\n---"
+
+        self.assertEqual(
+            convert_yaml_tags(frontmatter, {"#area": "Area"}), (frontmatter, 0)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()